@@ -1,14 +1,9 @@
-import os
-
-# Enable Debugging
-os.environ["NOMOS_LOG_LEVEL"] = "DEBUG"
-os.environ["NOMOS_ENABLE_LOGGING"] = "true"
-
 from nomos import *
-from nomos.llms import OpenAI
 from nomos.models.flow import FlowConfig
 from nomos.memory.flow import FlowMemoryComponent
 from barista_tools import tools
+from llm_singleton import get_llm
+from repl import run_session
 
 # Step Definitions for Order Taking Flow
 greeting_step = Step(
@@ -213,27 +208,10 @@ agent_config = AgentConfig(
     flows=[ordering_flow_config, checkout_flow_config],
 )
 
-# Initialize the LLM and Nomos agent
-llm = OpenAI()
-barista = Agent.from_config(config=agent_config, llm=llm, tools=tools)
-
-# Create a new session
-sess = barista.create_session()
+# Initialize the Nomos agent with the shared LLM
+barista = Agent.from_config(config=agent_config, llm=get_llm(), tools=tools)
+# Load models and warm connections now rather than on the first customer turn
+barista.warmup()
 
 # Simulating a conversation (You can use fastapi or any other method to get user input)
-user_input = None
-while True:
-    res = sess.next(user_input)
-    if res.decision.action == Action.RESPOND:
-        user_input = input(f"Assistant: {res.decision.response}\nYou: ")
-    elif res.decision.action == Action.END:
-        print("Session ended.")
-        break
-    else:
-        print("Unknown action. Exiting.")
-        break
-
-_save = input("Do you want to save the session? (y/n): ")
-if _save.lower() == "y":
-    # Save the session
-    sess.save_session()
+run_session(barista.create_session())
@@ -1,73 +1,94 @@
-import uuid
+import itertools
+from dataclasses import asdict, dataclass
 from typing import Literal, Optional
 
-from nomos.utils.logging import log_info
+from nomos.utils.logging import is_enabled_for, log_info
+
+
+@dataclass
+class CartItem:
+    """A single coffee in the cart."""
+
+    # Explicit slots keep items compact; dataclass(slots=True) needs Python 3.10
+    __slots__ = ("item_id", "coffee_type", "size", "price")
+    item_id: str
+    coffee_type: str
+    size: str
+    price: float
+
 
 # Simulate Inventory
-coffee_cart = []
+# The cart is keyed by item ID so removals are a single pop, and the total is
+# kept up to date on every mutation so reading it is O(1).
+coffee_cart: dict[str, CartItem] = {}
+_cart_total = 0.0
 sales = []
 
+# IDs only need to be unique within the process, so plain counters will do
+_item_counter = itertools.count(1)
+_order_counter = itertools.count(1)
+
+
+# Menu data is static, so the tool output is rendered once at import.
+_COFFEE_OPTIONS = [
+    {
+        "type": "Espresso",
+        "sizes": ["Small", "Medium", "Large"],
+        "prices": [2.5, 3.0, 3.5],
+    },
+    {
+        "type": "Latte",
+        "sizes": ["Small", "Medium", "Large"],
+        "prices": [3.0, 3.5, 4.0],
+    },
+    {
+        "type": "Cappuccino",
+        "sizes": ["Small", "Medium", "Large"],
+        "prices": [3.0, 3.5, 4.0],
+    },
+]
+_COFFEE_OPTIONS_STR = f"Available coffee options: {_COFFEE_OPTIONS!r}"
+
 
 # Tool Implementations
 def get_available_coffee_options() -> str:
     """
     Get available coffee options, sizes, and prices.
     """
-    coffee_options = [
-        {
-            "type": "Espresso",
-            "sizes": ["Small", "Medium", "Large"],
-            "prices": [2.5, 3.0, 3.5],
-        },
-        {
-            "type": "Latte",
-            "sizes": ["Small", "Medium", "Large"],
-            "prices": [3.0, 3.5, 4.0],
-        },
-        {
-            "type": "Cappuccino",
-            "sizes": ["Small", "Medium", "Large"],
-            "prices": [3.0, 3.5, 4.0],
-        },
-    ]
-    return f"Available coffee options: {coffee_options}"
+    return _COFFEE_OPTIONS_STR
 
 
 def add_to_cart(coffee_type: str, size: str, price: float) -> str:
     """
     Add a coffee item to the cart.
     """
-    global coffee_cart
-    item_id = str(uuid.uuid4())
-    log_info(
-        f"Adding item to cart: {item_id}, Coffee Type: {coffee_type}, Size: {size}, Price: {price}"
-    )
-    coffee_cart.append(
-        {
-            "item_id": item_id,
-            "coffee_type": coffee_type,
-            "size": size,
-            "price": price,
-        }
-    )
-    current_total = get_total_price()
-    return f"Item {item_id} added to cart. Current total: ${current_total:.2f}"
+    global _cart_total
+    item_id = f"i{next(_item_counter)}"
+    if is_enabled_for("INFO"):
+        log_info(
+            f"Adding item to cart: {item_id}, Coffee Type: {coffee_type}, Size: {size}, Price: {price}"
+        )
+    coffee_cart[item_id] = CartItem(item_id, coffee_type, size, price)
+    _cart_total += price
+    return f"Item {item_id} added to cart. Current total: ${_cart_total:.2f}"
 
 
 def get_total_price() -> float:
     """
     Calculate the total price of all orders in the cart.
     """
-    total_price = sum(item["price"] for item in coffee_cart)
-    return total_price
+    return _cart_total
 
 
 def remove_item(item_id: str) -> str:
     """
     Remove an item from the cart.
     """
-    global coffee_cart
-    coffee_cart = [item for item in coffee_cart if item["item_id"] != item_id]
+    global _cart_total
+    removed = coffee_cart.pop(item_id, None)
+    if removed is None:
+        return f"Item {item_id} not found in the cart."
+    _cart_total -= removed.price
     return f"Item {item_id} removed successfully."
 
 
@@ -75,8 +96,9 @@ def clear_cart() -> str:
     """
     Clear all items from the cart.
     """
-    global coffee_cart
-    coffee_cart = []
+    global _cart_total
+    coffee_cart.clear()
+    _cart_total = 0.0
     return "All items cleared successfully."
 
 
@@ -86,11 +108,14 @@ def get_order_summary() -> str:
     """
     if not coffee_cart:
         return "No Items in the cart."
-    summary = "\n".join(
-        f"Item ID: {item['item_id']}, Coffee: {item['coffee_type']}, Size: {item['size']}, Price: ${item['price']:.2f}"
-        for item in coffee_cart
-    )
-    return f"Order Summary:\n{summary}\nTotal Price: ${get_total_price():.2f}"
+    # str.join materializes its input anyway, so hand it a list, not a generator
+    rows = [
+        f"Item ID: {item.item_id}, Coffee: {item.coffee_type}, "
+        f"Size: {item.size}, Price: ${item.price:.2f}"
+        for item in coffee_cart.values()
+    ]
+    summary = "\n".join(rows)
+    return f"Order Summary:\n{summary}\nTotal Price: ${_cart_total:.2f}"
 
 
 def finalize_order(
@@ -99,30 +124,37 @@ def finalize_order(
     """
     Finalize the order and clear the cart.
     """
-    global coffee_cart
+    global coffee_cart, _cart_total
     if not coffee_cart:
         return "No orders to finalize."
-    total_price = get_total_price()
-    balance = payment - total_price if (payment and payment_method == "Cash") else None
-    if balance < 0:
-        return (
-            f"Insufficient payment amount for the order. Requires ${-balance:.2f} more."
-        )
+    total_price = _cart_total
+    if payment_method == "Cash":
+        if payment is None or payment < total_price:
+            return (
+                "Insufficient payment amount for the order. "
+                f"Requires ${total_price - (payment or 0):.2f} more."
+            )
+        change = payment - total_price
+    else:
+        change = None
+    # The sale keeps plain copies of the items, as the cart's are mutable
+    items = [asdict(item) for item in coffee_cart.values()]
+    coffee_cart = {}
+    _cart_total = 0.0
     sales.append(
         {
-            "order_id": str(uuid.uuid4()),
+            "order_id": f"o{next(_order_counter)}",
             "total_price": total_price,
             "payment_method": payment_method,
             "payment": payment,
-            "balance": payment - total_price if payment else None,
-            "items": coffee_cart.copy(),
+            "balance": change,
+            "items": items,
         }
     )
-    clear_cart()
-    if balance is not None or balance > 0:
+    if change:
         return (
             f"Order finalized! Total price: ${total_price:.2f}. "
-            f"Payment method: {payment_method}. Change: ${balance:.2f}. Thank you for your order!"
+            f"Payment method: {payment_method}. Change: ${change:.2f}. Thank you for your order!"
         )
     return (
         f"Order finalized! Total price: ${total_price:.2f}. Thank you for your order!"
@@ -1,32 +1,31 @@
 import os
-
-# Enable Debugging
-os.environ["NOMOS_LOG_LEVEL"] = "DEBUG"
-os.environ["NOMOS_ENABLE_LOGGING"] = "true"
+from functools import lru_cache
 
 from nomos import *
-from nomos.llms.openai import OpenAI
+from llm_singleton import get_llm
+from repl import run_session
 
-# Define the LLM and Barista
-config = AgentConfig.from_yaml("config.barista.yaml")
-llm = config.llm.get_llm() if hasattr(config, "llm") and config.llm else OpenAI()
-barista = Agent.from_config(config, llm)
+CONFIG_PATH = "config.agent.yaml"
 
-# Start the conversation
-sess = barista.create_session()
 
-user_input = None
-while True:
-    res = sess.next(user_input)
-    if res.decision.action == Action.RESPOND:
-        user_input = input(f"Assistant: {res.decision.response}\nYou: ")
-    elif res.decision.action == Action.END:
-        print("Session ended.")
-        break
+@lru_cache(maxsize=8)
+def _load_agent(path: str, mtime: float) -> Agent:
+    """Parse the config and build the agent once per config file version."""
+    config = AgentConfig.from_yaml(path)
+    if config.llm is None:
+        llm = get_llm()
+    elif config.llm.provider == "openai" and not config.llm.kwargs:
+        # Extra client kwargs need their own client, so only plain configs share one
+        llm = get_llm(config.llm.model, config.llm.embedding_model)
     else:
-        print("Unknown action. Exiting.")
-        break
+        llm = config.llm.get_llm()
+    agent = Agent.from_config(config, llm)
+    agent.warmup()
+    return agent
+
+
+# Define the LLM and Barista
+barista = _load_agent(CONFIG_PATH, os.path.getmtime(CONFIG_PATH))
 
-_save = input("Do you want to save the session? (y/n): ")
-if _save.lower() == "y":
-    sess.save_session()
+# Simulating a conversation (You can use fastapi or any other method to get user input)
+run_session(barista.create_session())
@@ -0,0 +1,26 @@
+"""Shared OpenAI LLM for the barista examples."""
+
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+
+from nomos.llms import OpenAI
+
+# One pooled HTTP client so every agent and session reuses the same connections
+http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+)
+
+
+@lru_cache(maxsize=None)
+def get_llm(
+    model: str = "gpt-4o-mini", embedding_model: Optional[str] = None
+) -> OpenAI:
+    """Get the shared OpenAI LLM for a model, backed by the pooled HTTP client."""
+    return OpenAI(
+        model=model, embedding_model=embedding_model, http_client=http_client
+    )
+
+
+__all__ = ["get_llm", "http_client"]
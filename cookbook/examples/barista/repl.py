@@ -0,0 +1,62 @@
+"""Interactive REPL shared by the barista examples."""
+
+import asyncio
+import os
+from typing import Optional
+
+from nomos.core import Session
+from nomos.models.agent import Action
+from nomos.utils.logging import log_debug
+from semantic_cache import SemanticCache
+
+
+async def _loop(sess: Session, cache: Optional[SemanticCache]) -> None:
+    """Run the conversation until the session ends."""
+    user_input = None
+    while True:
+        res = cache.next(sess, user_input) if cache else sess.next(user_input)
+        if res.decision.action == Action.RESPOND:
+            # Warm the next step's caches while the customer is typing
+            prefetch = asyncio.create_task(asyncio.to_thread(sess.precompute_next_step))
+            user_input = await asyncio.to_thread(
+                input, f"Assistant: {res.decision.response}\nYou: "
+            )
+            try:
+                await prefetch
+            except Exception as e:
+                # Prefetching is only speculative, so a failure is not fatal
+                log_debug(f"Skipping failed next-step prefetch: {e}")
+        elif res.decision.action == Action.END:
+            print("Session ended.")
+            break
+        else:
+            print("Unknown action. Exiting.")
+            break
+
+
+def run_session(sess: Session, *, use_cache: bool = False) -> None:
+    """
+    Chat with a session from the terminal.
+
+    :param sess: The session to run.
+    :param use_cache: Whether to serve repeated answers from a semantic cache.
+        Each turn then embeds the user input, which is an extra API call.
+    """
+    cache = None
+    # Entries depend on the agent's steps and replies, not on one conversation,
+    # so the cache file is shared by every session of the agent
+    cache_path = f"{sess.name}.cache.json"
+    if use_cache:
+        cache = SemanticCache(sess.embedding_model)
+        if os.path.exists(cache_path):
+            cache.load(cache_path)
+    asyncio.run(_loop(sess, cache))
+    if cache is not None:
+        cache.save(cache_path)
+
+    _save = input("Do you want to save the session? (y/n): ")
+    if _save.lower() == "y":
+        sess.save_session()
+
+
+__all__ = ["run_session"]
@@ -0,0 +1,132 @@
+"""Semantic response cache for the barista REPL examples."""
+
+import json
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from nomos.core import Session
+from nomos.llms import LLMBase
+from nomos.models.agent import Action, Response
+
+
+class SemanticCache:
+    """
+    Reuse RESPOND decisions for semantically equivalent user inputs.
+
+    Entries are keyed on the step the session was in, the assistant message the
+    user was answering, and the embedding of the user input. "yes", "yeah sure"
+    and "ok" to the same question can be served without another LLM round-trip,
+    while "yes" to a different question still goes to the LLM.
+    """
+
+    def __init__(self, embedding_model: LLMBase, threshold: float = 0.92) -> None:
+        """
+        Initialize the cache.
+
+        :param embedding_model: LLMBase instance used to embed user inputs.
+        :param threshold: Minimum cosine similarity for a cache hit.
+        """
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self._keys: List[tuple] = []
+        self._key_set: Set[tuple] = set()
+        self._embeddings: Optional[np.ndarray] = None
+        self._responses: List[Response] = []
+        # Last reply served to each session, i.e. what its user is answering
+        self._last_reply: Dict[str, str] = {}
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed and L2-normalize a text so a dot product is a cosine similarity."""
+        emb = np.asarray(self.embedding_model.embed_text(text), dtype=np.float64)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+
+    def lookup(self, key: tuple, emb: np.ndarray) -> Optional[Response]:
+        """Return the cached response closest to `emb` for `key`, if any."""
+        if self._embeddings is None:
+            return None
+        sims = self._embeddings @ emb
+        for i in np.argsort(sims)[::-1]:
+            if sims[i] < self.threshold:
+                break
+            if self._keys[i] == key:
+                return self._responses[i]
+        return None
+
+    def insert(self, key: tuple, emb: np.ndarray, response: Response) -> None:
+        """Add a response to the cache."""
+        self._keys.append(key)
+        self._key_set.add(key)
+        self._responses.append(response)
+        self._embeddings = (
+            emb[np.newaxis, :]
+            if self._embeddings is None
+            else np.vstack((self._embeddings, emb))
+        )
+
+    def next(self, sess: Session, user_input: Optional[str]) -> Response:
+        """
+        Advance the session, serving the decision from the cache when possible.
+
+        :param sess: The session to advance.
+        :param user_input: Optional user input string.
+        :return: The response from the cache or from `sess.next`.
+        """
+        if not user_input:
+            res = sess.next(user_input)
+            self._last_reply[sess.session_id] = str(res.decision.response)
+            return res
+
+        step_id = sess.current_step.step_id
+        key = (step_id, self._last_reply.get(sess.session_id))
+        # Only pay for an embedding when an entry could match
+        emb = self._embed(user_input) if key in self._key_set else None
+        cached = self.lookup(key, emb) if emb is not None else None
+        if cached is not None:
+            res = sess.record_response(user_input, cached)
+        else:
+            res = sess.next(user_input)
+            # Only responses from tool-less steps that stayed in the same step
+            # are safe to replay; anything else may skip a tool side effect.
+            if (
+                res.decision.action == Action.RESPOND
+                and sess.current_step.step_id == step_id
+                and not sess.current_step.available_tools
+            ):
+                if emb is None:
+                    emb = self._embed(user_input)
+                self.insert(key, emb, res)
+        self._last_reply[sess.session_id] = str(res.decision.response)
+        return res
+
+    def save(self, path: str) -> None:
+        """Write the cache entries to a JSON file."""
+        entries = [
+            {
+                "key": list(key),
+                "embedding": emb.tolist(),
+                "response": response.model_dump(mode="json"),
+            }
+            for key, emb, response in zip(
+                self._keys,
+                self._embeddings if self._embeddings is not None else [],
+                self._responses,
+            )
+        ]
+        with open(path, "w") as f:
+            json.dump(entries, f)
+
+    def load(self, path: str) -> None:
+        """Add the entries saved by `save` to the cache."""
+        with open(path) as f:
+            entries = json.load(f)
+        for entry in entries:
+            self.insert(
+                tuple(entry["key"]),
+                np.asarray(entry["embedding"], dtype=np.float64),
+                Response.model_validate(entry["response"]),
+            )
+
+
+__all__ = ["SemanticCache"]
@@ -1,5 +1,7 @@
+from collections import defaultdict
+from math import prod
 from typing import List, Union, Dict, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 def solve_arithmetic(
@@ -13,22 +15,21 @@ def solve_arithmetic(
 
     if operation == "add":
         result = sum(numbers)
-        if show_steps:
-            steps = [
-                f"Start with {numbers[0]}",
-                *[f"Add {num}" for num in numbers[1:]],
-                f"Final result: {result}",
-            ]
     elif operation == "multiply":
-        result = 1
-        for num in numbers:
-            result *= num
-        if show_steps:
-            steps = [
-                f"Start with {numbers[0]}",
-                *[f"Multiply by {num}" for num in numbers[1:]],
-                f"Final result: {result}",
-            ]
+        result = prod(numbers)
+
+    if show_steps and operation == "add":
+        steps = [
+            f"Start with {numbers[0]}",
+            *[f"Add {num}" for num in numbers[1:]],
+            f"Final result: {result}",
+        ]
+    elif show_steps and operation == "multiply":
+        steps = [
+            f"Start with {numbers[0]}",
+            *[f"Multiply by {num}" for num in numbers[1:]],
+            f"Final result: {result}",
+        ]
 
     return {"result": result, "steps": "\n".join(steps) if steps else ""}
 
@@ -78,16 +79,22 @@ financial_data = {
         "Entertainment": 0.1,
         "Savings": 0.2,
     },
+    # Running sum of expense amounts, kept in step with "expenses" by add_expense
+    "_expenses_total": 0.0,
 }
 
+# The allocation is fixed, so freeze it once instead of walking the dict per call
+_BUDGET_ITEMS = tuple(financial_data["budget_categories"].items())
+
 
 def calculate_budget(monthly_income: float) -> Dict[str, float]:
     """
     Calculate recommended budget allocation based on monthly income
     """
-    budget = {}
-    for category, percentage in financial_data["budget_categories"].items():
-        budget[category] = round(monthly_income * percentage, 2)
+    budget = {
+        category: round(monthly_income * percentage, 2)
+        for category, percentage in _BUDGET_ITEMS
+    }
     return {
         "budget": budget,
         "total": monthly_income,
@@ -111,10 +118,11 @@ def add_expense(
         "date": date,
     }
     financial_data["expenses"].append(expense)
+    financial_data["_expenses_total"] += amount
 
     return {
         "message": f"Expense of ${amount:.2f} added to {category}",
-        "current_total": sum(e["amount"] for e in financial_data["expenses"]),
+        "current_total": financial_data["_expenses_total"],
     }
 
 
@@ -122,12 +130,14 @@ def get_expense_summary() -> Dict[str, Union[Dict, float]]:
     """
     Get summary of expenses by category
     """
-    summary = {}
-    for category in financial_data["budget_categories"].keys():
-        category_expenses = [
-            e["amount"] for e in financial_data["expenses"] if e["category"] == category
-        ]
-        summary[category] = sum(category_expenses)
+    # Aggregate every expense in one pass, then project onto the budget categories
+    totals: Dict[str, float] = defaultdict(float)
+    for e in financial_data["expenses"]:
+        totals[e["category"]] += e["amount"]
+    summary = {
+        category: totals.get(category, 0)
+        for category in financial_data["budget_categories"]
+    }
 
     return {"summary": summary, "total": sum(summary.values())}
 
@@ -156,8 +166,14 @@ def calculate_monthly_savings(target_amount: float, target_date: str) -> float:
     """
     Calculate required monthly savings to reach goal
     """
-    target = datetime.strptime(target_date, "%Y-%m-%d")
-    months = (target - datetime.now()).days / 30
+    # The format is fixed (YYYY-MM-DD), so split it directly instead of strptime;
+    # anything else goes through strptime, which reports what is wrong with it
+    try:
+        year, month, day = target_date.split("-")
+        target = date(int(year), int(month), int(day))
+    except ValueError:
+        target = datetime.strptime(target_date, "%Y-%m-%d").date()
+    months = (target - date.today()).days / 30
     if months <= 0:
         return target_amount
     return round(target_amount / months, 2)
@@ -167,7 +183,7 @@ def get_financial_health() -> Dict[str, Union[str, float]]:
     """
     Calculate and return financial health metrics
     """
-    expenses_total = sum(e["amount"] for e in financial_data["expenses"])
+    expenses_total = financial_data["_expenses_total"]
     income_total = sum(financial_data["income"])
 
     if income_total == 0:
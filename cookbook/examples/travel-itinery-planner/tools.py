@@ -1,61 +1,226 @@
+import asyncio
+import hashlib
+import importlib.util
 import os
-import requests
-import json
+import threading
+from functools import lru_cache
+from typing import Any, Awaitable, Optional, TypeVar
+
+import httpx
+import orjson
+
+from nomos.utils.logging import log_warning
 
 headers = {
     "X-API-KEY": os.getenv("SERPER_API_KEY", "your_api_key_here"),
     "Content-Type": "application/json",
 }
 
+SEARCH_URL = "https://google.serper.dev/search"
+SCRAPE_URL = "https://scrape.serper.dev"
 
-def search_google(query: str) -> str:
-    """
-    Search Google for a given query.
+# HTTP/2 needs the optional h2 package (httpx[http2]); plain HTTP/1.1 still works
+_HTTP2 = importlib.util.find_spec("h2") is not None
 
-    param query: The search query.
-    """
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    response = requests.request("POST", url, headers=headers, data=payload)
-    out = response.json()
+SEARCH_TTL = 60 * 60
+SCRAPE_TTL = 24 * 60 * 60
+# Scraped page text is truncated to keep tool output (and prompt tokens) bounded
+MAX_SCRAPE_CHARS = 8000
+
+
+@lru_cache(maxsize=None)
+def _client() -> httpx.Client:
+    """Get the shared client, so repeated sync tool calls reuse one connection."""
+    return httpx.Client(http2=_HTTP2, headers=headers, timeout=15)
+
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def _client_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop that owns the shared async client."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="serper", daemon=True).start()
+    return loop
+
+
+@lru_cache(maxsize=None)
+def _async_client() -> httpx.AsyncClient:
+    """Get the shared async client; it must only be used on `_client_loop`."""
+    return httpx.AsyncClient(http2=_HTTP2, headers=headers, timeout=15)
 
-    # Construct a markdown string with the search results
-    markdown = f"## Search Results for '{query}'\n\n"
+
+async def _on_client_loop(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the shared client's loop and await its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, _client_loop())
+    return await asyncio.wrap_future(future)
+
+
+@lru_cache(maxsize=None)
+def _cache() -> Any:
+    """Get the on-disk cache of raw Serper responses, or None without diskcache."""
+    try:
+        import diskcache
+    except ImportError:
+        return None
+    return diskcache.Cache(os.getenv("SERPER_CACHE_DIR", ".serper_cache"))
+
+
+def _cache_key(url: str, body: dict) -> str:
+    """Hash an endpoint and request body into a compact cache key."""
+    raw = url.encode() + orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _fetch(url: str, body: dict, ttl: int) -> dict:
+    """POST to a Serper endpoint, serving successful responses from the cache."""
+    cache = _cache()
+    key = _cache_key(url, body)
+    content = cache.get(key) if cache is not None else None
+    if content is None:
+        response = _client().post(url, content=orjson.dumps(body))
+        content = response.content
+        if response.is_success and cache is not None:
+            cache.set(key, content, expire=ttl)
+    return orjson.loads(content)
+
+
+async def _afetch(
+    client: httpx.AsyncClient, url: str, body: dict, ttl: int
+) -> dict:
+    """Async variant of `_fetch`."""
+    cache = _cache()
+    key = _cache_key(url, body)
+    content = cache.get(key) if cache is not None else None
+    if content is None:
+        response = await client.post(url, content=orjson.dumps(body))
+        content = response.content
+        if response.is_success and cache is not None:
+            cache.set(key, content, expire=ttl)
+    return orjson.loads(content)
+
+
+def _format_search(query: str, out: dict) -> str:
+    """Render a Serper search response as markdown."""
+    parts = [f"## Search Results for '{query}'\n\n"]
     for result in out.get("organic", []):
         title = result.get("title")
         link = result.get("link")
         snippet = result.get("snippet")
-        markdown += f"- **[{title}]({link})**: {snippet}\n"
-    markdown += "\n### Related Searches\n\n"
+        parts.append(f"- **[{title}]({link})**: {snippet}\n")
+    parts.append("\n### Related Searches\n\n")
     for related in out.get("relatedSearches", []):
         related_query = related.get("query")
-        markdown += f"- **{related_query}**\n"
-    return markdown
+        parts.append(f"- **{related_query}**\n")
+    return "".join(parts)
+
 
+def _format_scrape(url: str, out: dict, max_chars: int = MAX_SCRAPE_CHARS) -> str:
+    """Render a Serper scrape response as markdown, truncating the page text."""
+    metadata = out.get("metadata", {})
+    text = out.get("text", "No content available")
+    if max_chars > 0 and len(text) > max_chars:
+        text = text[:max_chars] + "\n\n[Content truncated]"
+    parts = [
+        f"## Scraped Content from '{url}'\n\n",
+        f"### Title: {metadata.get('title', 'No title available')}\n\n",
+        f"### Description: {metadata.get('Description', 'No description available')}\n\n",
+        f"### Content:\n{text}\n\n",
+    ]
+    return "".join(parts)
 
-def scrape_website(url: str) -> str:
+
+def search_google(query: str) -> str:
+    """
+    Search Google for a given query.
+
+    param query: The search query.
+    """
+    out = _fetch(SEARCH_URL, {"q": query}, SEARCH_TTL)
+    return _format_search(query, out)
+
+
+def scrape_website(url: str, max_chars: int = MAX_SCRAPE_CHARS) -> str:
     """
     Scrape a website for its content.
 
     param url: The URL of the website to scrape.
+    param max_chars: Maximum characters of page text to return. Use 0 for the full page.
     """
-    srv_url = "https://scrape.serper.dev"
-    payload = json.dumps({"url": url})
-    response = requests.request("POST", srv_url, headers=headers, data=payload)
-    out = response.json()
-
-    # Construct a markdown string with the scraped content
-    markdown = f"## Scraped Content from '{url}'\n\n"
-    markdown += (
-        f"### Title: {out.get('metadata', {}).get('title', 'No title available')}\n\n"
-    )
-    markdown += f"### Description: {out.get('metadata', {}).get('Description', 'No description available')}\n\n"
-    markdown += f"### Content:\n{out.get('text', 'No content available')}\n\n"
+    out = _fetch(SCRAPE_URL, {"url": url}, SCRAPE_TTL)
+    return _format_scrape(url, out, max_chars)
 
-    return markdown
 
+async def asearch_google(
+    query: str, client: Optional[httpx.AsyncClient] = None
+) -> str:
+    """
+    Search Google for a given query without blocking the event loop.
 
-tools = [search_google, scrape_website]
+    param query: The search query.
+    param client: Optional async client to use instead of the shared one.
+    """
+    if client is None:
+        return await _on_client_loop(asearch_google(query, _async_client()))
+    out = await _afetch(client, SEARCH_URL, {"q": query}, SEARCH_TTL)
+    return _format_search(query, out)
+
+
+async def ascrape_website(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    max_chars: int = MAX_SCRAPE_CHARS,
+) -> str:
+    """
+    Scrape a website for its content without blocking the event loop.
+
+    param url: The URL of the website to scrape.
+    param client: Optional async client to use instead of the shared one.
+    param max_chars: Maximum characters of page text to return. Use 0 for the full page.
+    """
+    if client is None:
+        return await _on_client_loop(
+            ascrape_website(url, _async_client(), max_chars)
+        )
+    out = await _afetch(client, SCRAPE_URL, {"url": url}, SCRAPE_TTL)
+    return _format_scrape(url, out, max_chars)
+
+
+async def search_and_scrape(query: str, k: int = 5) -> str:
+    """
+    Search Google and scrape the top results in one call.
+
+    param query: The search query.
+    param k: Number of top result pages to scrape.
+    """
+    return await _on_client_loop(_search_and_scrape(query, k, _async_client()))
+
+
+async def _search_and_scrape(query: str, k: int, client: httpx.AsyncClient) -> str:
+    """Search and scrape the top results with the given client."""
+    out = await _afetch(client, SEARCH_URL, {"q": query}, SEARCH_TTL)
+    links = [r["link"] for r in out.get("organic", [])[:k] if r.get("link")]
+    if not links:
+        return f"## No results found for '{query}'\n"
+
+    # All scrapes share the client's pooled (HTTP/2 when available) connections;
+    # a page that fails to scrape is left out rather than failing the search
+    results = await asyncio.gather(
+        *(ascrape_website(link, client) for link in links), return_exceptions=True
+    )
+    pages = []
+    for link, result in zip(links, results):
+        if isinstance(result, BaseException):
+            log_warning(f"Failed to scrape {link}: {result}")
+        else:
+            pages.append(result)
+    if not pages:
+        return f"## Could not scrape any results for '{query}'\n"
+    return f"## Top {len(pages)} results for '{query}'\n\n" + "".join(pages)
+
+
+tools = [search_google, scrape_website, search_and_scrape]
 
 if __name__ == "__main__":
     # Example usage
@@ -64,3 +229,5 @@ if __name__ == "__main__":
 
     url = "https://www.apple.com"
     print(scrape_website(url))
+
+    print(asyncio.run(search_and_scrape(query, k=3)))
@@ -4,18 +4,61 @@ Nomos is an open-source, configurable multi-step agent framework for building ad
 Define your agent's persona, tools, and step-by-step flows in Python or YAML—perfect for conversational, workflow, and automation use cases.
 """
 
-from .config import AgentConfig, ServerConfig
-from .core import Agent
-from .models.agent import Action, Route, State, Step, StepIdentifier, Summary
-from .models.flow import Flow, FlowComponent, FlowConfig, FlowContext, FlowManager
-from .server import run_server
-from .state_machine import StateMachine
-from .testing import smart_assert
-from .testing.e2e import Scenario, ScenarioRunner
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .config import AgentConfig, ServerConfig
+    from .core import Agent
+    from .models.agent import Action, Route, State, Step, StepIdentifier, Summary
+    from .models.flow import Flow, FlowComponent, FlowConfig, FlowContext, FlowManager
+    from .server import run_server
+    from .state_machine import StateMachine
+    from .testing import smart_assert
+    from .testing.e2e import Scenario, ScenarioRunner
 
 __version__ = "0.3.1"
 __author__ = "DoWhile"
 
+# Public names are resolved on first access (PEP 562), so importing `nomos` for
+# just the Agent doesn't pull in the server or testing modules
+_LAZY_IMPORTS = {
+    "Agent": ".core",
+    "AgentConfig": ".config",
+    "ServerConfig": ".config",
+    "Action": ".models.agent",
+    "Step": ".models.agent",
+    "StepIdentifier": ".models.agent",
+    "Summary": ".models.agent",
+    "Route": ".models.agent",
+    "State": ".models.agent",
+    "Flow": ".models.flow",
+    "FlowManager": ".models.flow",
+    "FlowContext": ".models.flow",
+    "FlowComponent": ".models.flow",
+    "FlowConfig": ".models.flow",
+    "run_server": ".server",
+    "smart_assert": ".testing",
+    "ScenarioRunner": ".testing.e2e",
+    "Scenario": ".testing.e2e",
+    "StateMachine": ".state_machine",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import a public name from its module on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List the module attributes, including the lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 __all__ = [
     "Agent",
     "AgentConfig",
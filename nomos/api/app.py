@@ -1,30 +1,50 @@
 """Nomos Agent API."""
 
+import asyncio
 import datetime
 import os
 import pathlib
+import time
 import uuid
 from contextlib import asynccontextmanager, suppress
-from typing import AsyncGenerator, List, Optional, Union
+from functools import lru_cache
+from typing import AsyncGenerator, Optional
 
+import orjson
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
 
 
 from nomos.api.agent import agent
-from nomos.api.db import init_db
+from nomos.api.db import close_db, init_db
 from nomos.api.models import ChatRequest, ChatResponse, Message, SessionResponse
 from nomos.api.session_store import SessionStore, create_session_store
 from nomos.api.yaml_to_mermaid import generate_config_json, parse_yaml_config
-from nomos.models.agent import Message as FlowMessage, StepIdentifier, Summary
+from nomos.models.agent import Decision
 
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 SERVICE_NAME = os.getenv("SERVICE_NAME", "nomos-agent")
 SERVICE_VERSION = os.getenv("SERVICE_VERSION", "0.0.1")
+# Seconds to wait for more WebSocket messages to fold into the same turn; off
+# by default, since folding answers several messages with a single reply
+WS_BURST_WINDOW = float(os.getenv("WS_BURST_WINDOW", "0"))
 
 session_store: Optional[SessionStore] = None
+# Chat UI page, read once at startup (None when the file is missing)
+chat_ui: Optional[bytes] = None
+
+# Attribute holding the opening decision of a session initiated over HTTP, so a
+# WebSocket that connects with initiate=true can replay it instead of asking the
+# LLM for a second opening turn. The decision isn't part of the session state:
+# only the in-memory store hands back the same session object. With Redis or
+# the database the session is rebuilt from its state, and the WebSocket asks
+# the LLM for a new opening turn. Any later turn drops it, as it is no longer
+# the latest reply.
+_INITIAL_DECISION_ATTR = "_initial_decision"
 
 BASE_DIR = pathlib.Path(__file__).parent.absolute()
 
@@ -32,7 +52,9 @@ BASE_DIR = pathlib.Path(__file__).parent.absolute()
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan context manager for FastAPI app."""
-    global session_store
+    global session_store, chat_ui
+    chat_ui_path = BASE_DIR / "static" / "index.html"
+    chat_ui = chat_ui_path.read_bytes() if chat_ui_path.exists() else None
     # Initialize database
     await init_db()
     session_store = await create_session_store()
@@ -40,9 +62,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     # Cleanup
     await session_store.close()
+    await close_db()
 
 
-app = FastAPI(title=f"{SERVICE_NAME}-api", version=SERVICE_VERSION, lifespan=lifespan)
+app = FastAPI(
+    title=f"{SERVICE_NAME}-api",
+    version=SERVICE_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -61,60 +89,75 @@ app.mount("/static", StaticFiles(directory=str(BASE_DIR)), name="static")
 @app.get("/", response_class=HTMLResponse)
 async def get_chat_ui() -> HTMLResponse:
     """Serve the chat UI HTML file."""
-    chat_ui_path = BASE_DIR / "static" / "index.html"
-    if not chat_ui_path.exists():
+    if chat_ui is None:
         raise HTTPException(status_code=404, detail="Chat UI file not found")
 
-    with open(chat_ui_path, "r") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(
+        content=chat_ui, headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+def _decision_payload(sid: str, decision: BaseModel) -> str:
+    """Serialize a session's decision as a `SessionResponse`."""
+    return SessionResponse(
+        session_id=sid, message=decision.model_dump(mode="json")
+    ).model_dump_json()
+
+
+def _decision_response(sid: str, decision: BaseModel) -> Response:
+    """Build an HTTP response for a session's decision."""
+    # Returning the response directly skips re-validating it against
+    # SessionResponse, which is still used for the OpenAPI schema
+    return Response(
+        content=_decision_payload(sid, decision), media_type="application/json"
+    )
 
 
 @app.post("/session", response_model=SessionResponse)
-async def create_session(initiate: Optional[bool] = False) -> SessionResponse:
+async def create_session(initiate: Optional[bool] = False) -> Response:
     """Create a new session."""
     assert session_store is not None, "Session store not initialized"
-    session_id = str(uuid.uuid4())
+    session_id = uuid.uuid4().hex
     session = agent.create_session()
+    # Get initial message from agent before storing, so the session is written once
+    if initiate:
+        # Turns block on the LLM, so they run in the threadpool rather than
+        # stalling every other request on the event loop
+        res = await run_in_threadpool(session.next, None)
+        setattr(session, _INITIAL_DECISION_ATTR, res.decision)
     await session_store.set(session_id, session)
-    # Get initial message from agent
     if initiate:
-        res = session.next(None)
-        await session_store.set(session_id, session)
-    return SessionResponse(
-        session_id=session_id,
-        message=(
-            res.decision.model_dump(mode="json")
-            if initiate
-            else {"status": "Session created successfully"}
-        ),
+        return _decision_response(session_id, res.decision)
+    return ORJSONResponse(
+        {
+            "session_id": session_id,
+            "message": {"status": "Session created successfully"},
+        }
     )
 
 
 @app.post("/session/{session_id}/message", response_model=SessionResponse)
-async def send_message(session_id: str, message: Message) -> SessionResponse:
+async def send_message(session_id: str, message: Message) -> Response:
     """Send a message to an existing session."""
     assert session_store is not None, "Session store not initialized"
     session = await session_store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    res = session.next(message.content)
+    vars(session).pop(_INITIAL_DECISION_ATTR, None)
+    res = await run_in_threadpool(session.next, message.content)
     await session_store.set(session_id, session)
-    return SessionResponse(
-        session_id=session_id, message=res.decision.model_dump(mode="json")
-    )
+    return _decision_response(session_id, res.decision)
 
 
 @app.delete("/session/{session_id}")
 async def end_session(session_id: str) -> dict:
     """End and cleanup a session."""
     assert session_store is not None, "Session store not initialized"
-    session = await session_store.get(session_id)
-    if not session:
+    # delete() reports whether the session existed, so there is no need to
+    # load (and rebuild) it first
+    if not await session_store.delete(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
-
-    # Clean up session
-    await session_store.delete(session_id)
     return {"message": "Session ended successfully"}
 
 
@@ -122,20 +165,23 @@ async def end_session(session_id: str) -> dict:
 async def get_session_history(session_id: str) -> dict:
     """Get the history of a session."""
     assert session_store is not None, "Session store not initialized"
-    session = await session_store.get(session_id)
-    if not session:
+    # The store filters the stored history directly, so the session (and its
+    # agent wiring) isn't rebuilt just to read its messages
+    history = await session_store.get_history(session_id)
+    if history is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Assuming session.history() returns a list of messages
-    history: List[Union[FlowMessage, StepIdentifier, Summary]] = (
-        session.memory.get_history()
-    )
-    history_json = [
-        msg.model_dump(mode="json")
-        for msg in history
-        if isinstance(msg, FlowMessage) and msg.role not in ["error", "fallback"]
-    ]
-    return {"session_id": session_id, "history": history_json}
+    return {"session_id": session_id, "history": history}
+
+
+async def _send_json(websocket: WebSocket, data: dict) -> None:
+    """Send a JSON text frame serialized with orjson."""
+    await websocket.send_text(orjson.dumps(data).decode())
+
+
+async def _send_decision(websocket: WebSocket, sid: str, decision: BaseModel) -> None:
+    """Send a turn's decision, letting pydantic serialize it straight to JSON."""
+    await websocket.send_text(_decision_payload(sid, decision))
 
 
 async def _handle_websocket(
@@ -150,45 +196,69 @@ async def _handle_websocket(
 
     created = session_id is None
     if created:
-        sid = str(uuid.uuid4())
+        sid = uuid.uuid4().hex
         session = agent.create_session()
-        await session_store.set(sid, session)
+        # An initiated session is stored once, after its first turn, below
+        if not initiate:
+            await session_store.set(sid, session)
     else:
         assert session_id is not None
         sid = session_id
         session_opt = await session_store.get(sid)
         if session_opt is None:
-            await websocket.send_json({"error": "Session not found"})
+            await _send_json(websocket, {"error": "Session not found"})
             await websocket.close()
             return
         session = session_opt
 
     if initiate:
-        res = session.next(None)
+        decision: Optional[Decision] = vars(session).pop(_INITIAL_DECISION_ATTR, None)
+        if decision is None:
+            # No replayable opening turn, e.g. the session came from Redis or
+            # the database, so run one now
+            decision = (await run_in_threadpool(session.next, None)).decision
         await session_store.set(sid, session)
-        await websocket.send_json(
-            {"session_id": sid, "message": res.decision.model_dump(mode="json")}
-        )
+        await _send_decision(websocket, sid, decision)
     elif created:
-        await websocket.send_json({"session_id": sid})
+        await _send_json(websocket, {"session_id": sid})
 
+    pending: Optional[dict] = None
     with suppress(WebSocketDisconnect):
         while True:
-            data = await websocket.receive_json()
+            if pending is not None:
+                data, pending = pending, None
+            else:
+                data = orjson.loads(await websocket.receive_text())
             if data.get("close"):
                 await websocket.close()
                 break
 
             user_message = data.get("message")
             if user_message is None:
-                await websocket.send_json({"error": "Invalid message"})
+                await _send_json(websocket, {"error": "Invalid message"})
                 continue
 
-            res = session.next(user_message)
-            await session_store.set(sid, session)
-            await websocket.send_json(
-                {"session_id": sid, "message": res.decision.model_dump(mode="json")}
-            )
+            # When enabled, fold a burst of messages into one turn and one reply;
+            # any other frame ends the burst and is handled on the next iteration
+            user_messages = [user_message]
+            while WS_BURST_WINDOW > 0:
+                try:
+                    raw = await asyncio.wait_for(
+                        websocket.receive_text(), timeout=WS_BURST_WINDOW
+                    )
+                except asyncio.TimeoutError:
+                    break
+                data = orjson.loads(raw)
+                if data.get("close") or data.get("message") is None:
+                    pending = data
+                    break
+                user_messages.append(data["message"])
+
+            vars(session).pop(_INITIAL_DECISION_ATTR, None)
+            res = await run_in_threadpool(session.next, "\n".join(user_messages))
+            # Database and Redis writes are batched across connections
+            await session_store.set(sid, session, write_behind=True)
+            await _send_decision(websocket, sid, res.decision)
 
 
 @app.websocket("/ws")
@@ -212,19 +282,47 @@ async def websocket_endpoint(
     await _handle_websocket(websocket, session_id, bool(initiate), bool(verbose))
 
 
-@app.post("/chat")
-async def chat(request: ChatRequest, verbose: bool = False) -> ChatResponse:
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, verbose: bool = False) -> ORJSONResponse:
     """Chat endpoint to get the next response from the agent based on the session data."""
-    res = agent.next(**request.model_dump(), verbose=verbose)
-    return ChatResponse(
-        response=res.decision.model_dump(mode="json"),
-        tool_output=res.tool_output,
-        session_data=res.state,
+    # The validated State is passed as is rather than dumped and re-validated
+    res = await run_in_threadpool(
+        agent.next,
+        user_input=request.user_input,
+        session_data=request.session_data,
+        verbose=verbose,
     )
+    assert res.state is not None
+    # The session history can be long, so skip validating it a second time
+    # against ChatResponse
+    return ORJSONResponse(
+        {
+            "response": res.decision.model_dump(mode="json"),
+            "tool_output": res.tool_output,
+            "session_data": res.state.model_dump(mode="json"),
+        }
+    )
+
+
+@lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    """Format a Unix timestamp, rebuilding the string at most once a second."""
+    return datetime.datetime.fromtimestamp(second).isoformat()
+
+
+@lru_cache(maxsize=4)
+def _config_json(path: str, mtime: float) -> dict:
+    """
+    Parse a YAML config and generate its JSON representation.
 
+    Cached on the file's modification time, so edits are picked up on the next
+    request without re-parsing an unchanged file.
+    """
+    return generate_config_json(parse_yaml_config(path))
 
-@app.get("/config", response_class=JSONResponse)
-async def get_agent_config() -> JSONResponse:
+
+@app.get("/config", response_class=ORJSONResponse)
+async def get_agent_config() -> ORJSONResponse:
     """Get the agent configuration as JSON with enhanced metadata."""
     config_path = pathlib.Path(
         os.getenv("CONFIG_PATH", str(BASE_DIR / "config.agent.yaml"))
@@ -235,15 +333,14 @@ async def get_agent_config() -> JSONResponse:
         )
 
     try:
-        # Parse the YAML configuration
-        config = parse_yaml_config(str(config_path))
-
-        # Generate enhanced JSON representation
-        config_json = generate_config_json(config)
-        config_json["metadata"]["generated_at"] = datetime.datetime.now().isoformat()
-        config_json["metadata"]["config_file_path"] = str(config_path)
-
-        return JSONResponse(content=config_json)
+        config_json = _config_json(str(config_path), config_path.stat().st_mtime)
+        # Copy the two levels that change so the cached dict is left untouched
+        metadata = {
+            **config_json["metadata"],
+            "generated_at": _iso_second(int(time.time())),
+            "config_file_path": str(config_path),
+        }
+        return ORJSONResponse(content={**config_json, "metadata": metadata})
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error processing configuration: {str(e)}"
@@ -256,4 +353,13 @@ if __name__ == "__main__":
 
     reload = "--reload" in sys.argv
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run("nomos.api.app:app", host="0.0.0.0", port=port, reload=reload)
+    # Same loop/parser selection as `run_server`: uvloop and httptools when
+    # importable, asyncio and h11 otherwise
+    uvicorn.run(
+        "nomos.api.app:app",
+        host="0.0.0.0",
+        port=port,
+        reload=reload,
+        loop="auto",
+        http="auto",
+    )
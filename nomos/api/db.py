@@ -1,9 +1,11 @@
 """Database initialization and session management for SQLModel with async support."""
 
 import os
+from typing import Optional
 
 from loguru import logger
 
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio.engine import create_async_engine
 
 from sqlmodel import SQLModel
@@ -11,7 +13,22 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_async_engine(DATABASE_URL) if DATABASE_URL else None
+engine = (
+    create_async_engine(
+        DATABASE_URL,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    )
+    if DATABASE_URL
+    else None
+)
+# Sessions are short-lived and created per operation, so concurrent requests
+# each check out their own pooled connection
+session_factory: Optional[async_sessionmaker[AsyncSession]] = (
+    async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    if engine
+    else None
+)
 
 
 async def init_db() -> None:
@@ -27,6 +44,12 @@ async def init_db() -> None:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
+async def close_db() -> None:
+    """Close all pooled database connections."""
+    if engine:
+        await engine.dispose()
+
+
 async def get_session() -> AsyncSession:
     """
     Get a new SQLAlchemy session.
@@ -36,4 +59,4 @@ async def get_session() -> AsyncSession:
     return AsyncSession(bind=engine, expire_on_commit=False)
 
 
-__all__ = ["init_db", "get_session"]
+__all__ = ["init_db", "close_db", "get_session", "session_factory"]
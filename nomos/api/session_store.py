@@ -1,25 +1,51 @@
 """Session store for managing session data in PostgreSQL and Redis."""
 
+import asyncio
 import os
-import pickle
-from datetime import datetime, timezone
-from typing import Dict, Optional
+from contextlib import suppress
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from loguru import logger
 
-from nomos.types import Session as AgentSession
-
-from redis.asyncio import Redis
+import orjson
 
+from nomos.types import Session as AgentSession
 
-from sqlalchemy import Column, DateTime, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, DateTime, cast, delete, func
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from sqlmodel import Field, SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .agent import agent
-from ..models.agent import State
+from .db import session_factory
+from ..models.agent import Message, State
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# Write-behind flushes happen every DB_FLUSH_INTERVAL seconds, or as
+# soon as DB_FLUSH_BATCH sessions are waiting
+DB_FLUSH_INTERVAL = float(os.getenv("DB_FLUSH_INTERVAL", "0.02"))
+DB_FLUSH_BATCH = int(os.getenv("DB_FLUSH_BATCH", "64"))
+
+# Message roles that are internal to the agent and left out of the history
+_HIDDEN_ROLES = ("error", "fallback")
+# JSON path selecting the visible messages from a stored history
+_VISIBLE_MESSAGES_PATH = "$[*] ? (exists(@.role) && " + " && ".join(
+    f'@.role != "{role}"' for role in _HIDDEN_ROLES
+) + ")"
+
+
+def _visible_messages(history: List[dict]) -> List[dict]:
+    """Filter a dumped history down to the messages shown to clients."""
+    return [
+        item
+        for item in history
+        if "role" in item and item["role"] not in _HIDDEN_ROLES
+    ]
 
 
 class Session(SQLModel, table=True):  # type: ignore
@@ -60,23 +86,21 @@ class InMemoryStore:
 
         This is a simple dictionary-based store that does not persist data.
         """
-        self._store: Dict[str, tuple[AgentSession, datetime]] = {}
+        self._store: Dict[str, AgentSession] = {}
 
     async def get(self, key: str) -> Optional[AgentSession]:
         """Get session from in-memory store."""
-        if key in self._store:
-            return self._store[key][0]
-        return None
+        return self._store.get(key)
 
     async def set(
         self, key: str, value: AgentSession, ttl: Optional[int] = None
     ) -> None:
         """Set session in in-memory store."""
-        self._store[key] = (value, datetime.now(timezone.utc))
+        self._store[key] = value
 
-    async def delete(self, key: str) -> None:
-        """Delete session from in-memory store."""
-        self._store.pop(key, None)
+    async def delete(self, key: str) -> bool:
+        """Delete session from in-memory store, returning whether it existed."""
+        return self._store.pop(key, None) is not None
 
 
 class SessionStore:
@@ -90,14 +114,16 @@ class SessionStore:
 
     def __init__(
         self,
-        db: Optional[AsyncSession] = None,
-        redis: Optional[Redis] = None,
+        db: Optional[async_sessionmaker[AsyncSession]] = None,
+        redis: Optional["Redis"] = None,
         cache_ttl: int = 3600,
     ) -> None:
         """
         Initialize the session store with optional database and Redis connections.
 
-        :param db: Optional SQLAlchemy AsyncSession for database operations.
+        :param db: Optional factory for the SQLAlchemy AsyncSessions used for
+            database operations. Each operation gets its own session, so
+            concurrent requests don't share a connection or a transaction.
         :param redis: Optional Redis client for caching.
         :param cache_ttl: Time-to-live for cache entries in seconds.
         """
@@ -105,6 +131,16 @@ class SessionStore:
         self.redis = redis
         self.cache_ttl = cache_ttl
         self.memory_store = InMemoryStore()
+        # Write-behind buffer for database and Redis writes, keyed by session ID
+        # so only the latest state of a session is written
+        self._pending_writes: Dict[str, dict] = {}
+        self._write_buffered = asyncio.Event()
+        self._flush_requested = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Database reads in flight, so concurrent misses for one session (say,
+        # a reconnect storm) share a single query
+        self._db_loads: Dict[str, asyncio.Future] = {}
 
         # Log storage configuration
         logger.info(
@@ -119,18 +155,35 @@ class SessionStore:
             try:
                 cached = await self.redis.get(f"session:{session_id}")
                 if cached:
-                    return pickle.loads(cached)
+                    state = State.model_validate_json(cached)
+                    return agent.get_session_from_state(state)
             except Exception as e:
                 logger.warning(f"Redis error: {e}. Falling back to memory cache.")
 
         return await self.memory_store.get(session_id)
 
-    async def _set_to_cache(self, session_id: str, session: AgentSession) -> None:
-        """Set session in cache (Redis or memory)."""
+    async def _set_to_cache(
+        self,
+        session_id: str,
+        session: AgentSession,
+        session_data: Optional[dict] = None,
+    ) -> None:
+        """
+        Set session in cache (Redis or memory).
+
+        :param session_id: The session ID.
+        :param session: The session to cache.
+        :param session_data: The session state already dumped to JSON-compatible
+            data, if the caller has it, so it isn't serialized again.
+        """
         if self.redis:
             try:
+                if session_data is None:
+                    session_data = session.get_state().model_dump(mode="json")
                 await self.redis.setex(
-                    f"session:{session_id}", self.cache_ttl, pickle.dumps(session)
+                    f"session:{session_id}",
+                    self.cache_ttl,
+                    orjson.dumps(session_data),
                 )
                 return
             except Exception as e:
@@ -138,50 +191,98 @@ class SessionStore:
 
         await self.memory_store.set(session_id, session)
 
-    async def _delete_from_cache(self, session_id: str) -> None:
-        """Delete session from cache (Redis or memory)."""
+    async def _set_many_to_cache(self, sessions: Dict[str, dict]) -> None:
+        """
+        Set several sessions in Redis in one pipelined round-trip.
+
+        :param sessions: Session data keyed by session ID.
+        """
+        if not self.redis or not sessions:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for session_id, session_data in sessions.items():
+                    pipe.setex(
+                        f"session:{session_id}",
+                        self.cache_ttl,
+                        orjson.dumps(session_data),
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis error: {e}. Sessions are only in the database.")
+
+    async def _delete_from_cache(self, session_id: str) -> bool:
+        """Delete session from cache (Redis or memory), returning whether it existed."""
         if self.redis:
             try:
-                await self.redis.delete(f"session:{session_id}")
-                return
+                # DEL reports how many keys it removed, so no separate GET is needed
+                return bool(await self.redis.delete(f"session:{session_id}"))
             except Exception as e:
                 logger.warning(f"Redis error: {e}. Falling back to memory cache.")
 
-        await self.memory_store.delete(session_id)
+        return await self.memory_store.delete(session_id)
 
-    async def _update_db(self, session_id: str, session: AgentSession) -> None:
-        """Update existing session in database or create new one."""
-        if not self.db:
+    async def _update_db(self, sessions: Dict[str, dict]) -> None:
+        """
+        Update existing sessions in database or create new ones.
+
+        :param sessions: Session data keyed by session ID.
+        """
+        if not self.db or not sessions:
             return
 
         try:
-            # Check if session exists
-            stmt = select(Session).where(Session.session_id == session_id)
-            result = await self.db.exec(stmt)
-            existing_session = result.first()
-
-            session_data = session.get_state().model_dump(mode="json")
-
-            if existing_session:
-                # Update existing session
-                existing_session.session_data = session_data
-                self.db.add(existing_session)
-            else:
-                # Create new session
-                session_model = Session(
-                    session_id=session_id, session_data=session_data
-                )
-                self.db.add(session_model)
-
-            await self.db.commit()
+            # A single upsert instead of SELECT followed by INSERT or UPDATE
+            stmt = insert(Session).values(
+                [
+                    {"session_id": session_id, "session_data": session_data}
+                    for session_id, session_data in sessions.items()
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Session.session_id],
+                set_={
+                    "session_data": stmt.excluded.session_data,
+                    "updated_at": func.now(),
+                },
+            )
+            # Leaving the block without a commit rolls the transaction back
+            async with self.db() as db:
+                await db.exec(stmt)
+                await db.commit()
 
         except Exception as e:
             logger.warning(f"Database error: {e}. Using memory store only.")
-            # Rollback the transaction on error
-            await self.db.rollback()
+
+    async def _delete_from_db(self, session_id: str) -> bool:
+        """Delete session from database, returning whether it existed."""
+        if not self.db:
+            return False
+
+        try:
+            # RETURNING tells whether a row existed without a separate SELECT
+            stmt = (
+                delete(Session)
+                .where(Session.session_id == session_id)
+                .returning(Session.session_id)
+            )
+            async with self.db() as db:
+                result = await db.exec(stmt)
+                deleted = result.first() is not None
+                await db.commit()
+            return deleted
+        except Exception as e:
+            logger.warning(f"Database error: {e}")
+            return False
 
     async def get(self, session_id: str) -> Optional[AgentSession]:
         """Get session from cache or database."""
+        # A buffered write is newer than anything in the cache or the database
+        pending = self._pending_writes.get(session_id)
+        if pending is not None:
+            return agent.get_session_from_state(State.model_validate(pending))
+
         # Try cache first
         session = await self._get_from_cache(session_id)
         if session:
@@ -190,52 +291,176 @@ class SessionStore:
         # Try database if available
         if self.db:
             try:
-                stmt = select(Session).where(Session.session_id == session_id)
-                result = await self.db.exec(stmt)
-                session_model = result.first()
-
-                if session_model:
-                    session_data = State.model_validate(session_model.session_data)
-                    session = agent.get_session_from_state(session_data)
+                load = self._db_loads.get(session_id)
+                owner = load is None
+                if load is None:
+                    load = asyncio.ensure_future(self._load_from_db(session_id))
+                    self._db_loads[session_id] = load
+                    load.add_done_callback(
+                        lambda _: self._db_loads.pop(session_id, None)
+                    )
+                # Shielded, so a cancelled caller doesn't cancel the shared load
+                session_data = await asyncio.shield(load)
+
+                if session_data is not None:
+                    # Each caller gets its own session, since sessions are mutable
+                    session = agent.get_session_from_state(
+                        State.model_validate(session_data)
+                    )
                     assert session is not None, "Session should not be None"
-                    await self._set_to_cache(session_id, session)
+                    if owner:
+                        # The stored row is already the cached representation
+                        await self._set_to_cache(session_id, session, session_data)
                     return session
             except Exception as e:
                 logger.warning(f"Database error: {e}. Falling back to memory store.")
 
         return None
 
-    async def set(self, session_id: str, session: AgentSession) -> None:
-        """Set or update session in both database and cache."""
-        # Update database if available
-        if self.db:
-            await self._update_db(session_id, session)
+    async def _load_from_db(self, session_id: str) -> Optional[dict]:
+        """Read a session's stored state from the database."""
+        assert self.db is not None
+        stmt = select(Session.session_data).where(Session.session_id == session_id)
+        async with self.db() as db:
+            return (await db.exec(stmt)).first()
 
-        # Update cache
-        await self._set_to_cache(session_id, session)
+    async def get_history(self, session_id: str) -> Optional[List[dict]]:
+        """
+        Get the visible messages of a session without rebuilding it.
 
-    async def delete(self, session_id: str) -> None:
-        """Delete session from both database and cache."""
-        # Delete from database if available
-        if self.db:
+        Errors and fallbacks are left out. A database hit is filtered in SQL.
+
+        :param session_id: The session ID.
+        :return: The messages as JSON-compatible dicts, or None if not found.
+        """
+        pending = self._pending_writes.get(session_id)
+        if pending is not None:
+            return _visible_messages(pending["history"])
+
+        if self.redis:
             try:
-                stmt = select(Session).where(Session.session_id == session_id)
-                result = await self.db.exec(stmt)
-                session_model = result.first()
+                cached = await self.redis.get(f"session:{session_id}")
+                if cached:
+                    return _visible_messages(orjson.loads(cached)["history"])
+            except Exception as e:
+                logger.warning(f"Redis error: {e}. Falling back to memory cache.")
+
+        session = await self.memory_store.get(session_id)
+        if session:
+            # The full context, like the history stored in Redis and the database
+            return [
+                msg.model_dump(mode="json")
+                for msg in session.memory.context
+                if isinstance(msg, Message) and msg.role not in _HIDDEN_ROLES
+            ]
 
-                if session_model:
-                    await self.db.delete(session_model)
-                    await self.db.commit()
+        if self.db:
+            try:
+                stmt = select(
+                    func.jsonb_path_query_array(
+                        Session.session_data["history"],
+                        cast(_VISIBLE_MESSAGES_PATH, JSONPATH),
+                        type_=JSONB,
+                    )
+                ).where(Session.session_id == session_id)
+                async with self.db() as db:
+                    return (await db.exec(stmt)).first()
             except Exception as e:
                 logger.warning(f"Database error: {e}")
 
-        # Delete from cache
-        await self._delete_from_cache(session_id)
+        return None
+
+    async def _flush_loop(self) -> None:
+        """Write buffered sessions to the database and Redis in batches."""
+        while not self._closing:
+            # Sleep until a write is buffered, so an idle store doesn't wake up,
+            # then give the batch DB_FLUSH_INTERVAL seconds to fill
+            await self._write_buffered.wait()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=DB_FLUSH_INTERVAL
+                )
+            self._write_buffered.clear()
+            self._flush_requested.clear()
+            await self._flush_writes()
+
+    async def _flush_writes(self) -> None:
+        """Write all buffered sessions in one upsert and one Redis pipeline."""
+        sessions, self._pending_writes = self._pending_writes, {}
+        await asyncio.gather(
+            self._update_db(sessions), self._set_many_to_cache(sessions)
+        )
+
+    async def set(
+        self, session_id: str, session: AgentSession, write_behind: bool = False
+    ) -> None:
+        """
+        Set or update session in both database and cache.
+
+        :param session_id: The session ID.
+        :param session: The session to store.
+        :param write_behind: Buffer the database and Redis writes, which a
+            background task flushes in batches. Without Redis, the in-memory
+            cache is still updated right away. Reads in this process see the
+            buffered state until the flush.
+        """
+        if write_behind and (self.db or self.redis):
+            if not self.redis:
+                await self.memory_store.set(session_id, session)
+            self._pending_writes[session_id] = session.get_state().model_dump(
+                mode="json"
+            )
+            self._write_buffered.set()
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_loop())
+            if len(self._pending_writes) >= DB_FLUSH_BATCH:
+                self._flush_requested.set()
+            return
+
+        # This write is newer than a buffered one, which must not overwrite it
+        self._pending_writes.pop(session_id, None)
+
+        if not self.db:
+            await self._set_to_cache(session_id, session)
+            return
+
+        # The database and Redis share one representation, so the state is
+        # dumped once and reused for the cache
+        session_data = session.get_state().model_dump(mode="json")
+
+        # Both writes log and swallow their own errors, so they can overlap
+        await asyncio.gather(
+            self._update_db({session_id: session_data}),
+            self._set_to_cache(session_id, session, session_data),
+        )
+
+    async def delete(self, session_id: str) -> bool:
+        """
+        Delete session from both database and cache.
+
+        :param session_id: The session ID to delete.
+        :return: True if the session existed in the database, the cache or the
+            write-behind buffer.
+        """
+        # Drop a buffered write so the flush doesn't bring the session back
+        pending = self._pending_writes.pop(session_id, None) is not None
+        deleted, cached = await asyncio.gather(
+            self._delete_from_db(session_id), self._delete_from_cache(session_id)
+        )
+        return deleted or cached or pending
 
     async def close(self) -> None:
-        """Close database and Redis connections."""
-        if self.db:
-            await self.db.close()
+        """Flush buffered writes and close database and Redis connections."""
+        if self._flush_task is not None:
+            # Stop the loop rather than cancel it, so a batch it has already
+            # taken from the buffer is still written
+            self._closing = True
+            self._write_buffered.set()
+            self._flush_requested.set()
+            await self._flush_task
+            self._flush_task = None
+            self._closing = False
+        await self._flush_writes()
         if self.redis:
             await self.redis.close()
 
@@ -251,27 +476,27 @@ async def create_session_store() -> SessionStore:
 
     :return: An instance of SessionStore.
     """
-    db_session = None
     redis_client = None
 
-    # Try to initialize database connection
-    if os.getenv("DATABASE_URL"):
-        try:
-            from .db import get_session
-
-            db_session = await get_session()
-        except Exception as e:
-            logger.warning(f"Failed to initialize database: {e}")
-
     # Try to initialize Redis connection
     redis_url = os.getenv("REDIS_URL")
     if redis_url:
         try:
-            redis_client = Redis.from_url(redis_url)
+            # redis is only imported when a cache is configured
+            from redis.asyncio import ConnectionPool, Redis
+
+            # Size the pool explicitly so concurrent WebSocket turns don't queue
+            # on connections; payloads are JSON bytes, so responses stay undecoded
+            pool = ConnectionPool.from_url(
+                redis_url,
+                max_connections=int(os.getenv("REDIS_POOL_SIZE", "64")),
+                decode_responses=False,
+            )
+            redis_client = Redis.from_pool(pool)
         except Exception as e:
             logger.warning(f"Failed to initialize Redis: {e}")
 
-    return SessionStore(db=db_session, redis=redis_client)
+    return SessionStore(db=session_factory, redis=redis_client)
 
 
 __all__ = ["create_session_store", "SessionStore", "Session"]
@@ -1,5 +1,6 @@
 """Load tool modules for the API server."""
 
+import importlib
 import os
 import sys
 
@@ -14,10 +15,20 @@ for path in TOOL_DIRS.split(os.pathsep):
     if not os.path.isdir(path):
         continue
 
-    for filename in os.listdir(path):
-        if filename.endswith(".py") and filename != "__init__.py":
-            module_name = filename[:-3]
-            module = __import__(module_name)
-            tool_list.extend(getattr(module, "tools", []))
+    # scandir yields the file type with each entry, so no extra stat per file;
+    # sorting keeps the tool order stable across filesystems
+    with os.scandir(path) as entries:
+        module_names = sorted(
+            entry.name[:-3]
+            for entry in entries
+            if entry.name.endswith(".py")
+            and entry.name != "__init__.py"
+            and entry.is_file()
+        )
+    for module_name in module_names:
+        # import_module returns modules already in sys.modules and otherwise
+        # loads from the __pycache__ bytecode when it is current
+        module = importlib.import_module(module_name)
+        tool_list.extend(getattr(module, "tools", []))
 
 __all__ = ["tool_list"]
@@ -17,13 +17,41 @@ import argparse
 import datetime
 import json
 import re
-from typing import Any, Dict, List, Set
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
 
 from nomos.utils.logging import log_error, log_info
 
 import yaml
 
-
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9_]")
+# Route labels drop "User " and "User wants " in one pass
+_CONDITION_USER_RE = re.compile(r"User (?:wants )?")
+
+# Short node labels for well-known step descriptions, checked in order: a rule
+# matches when the lowercased description has every keyword in its first
+# tuple and, if the second tuple is not empty, at least one keyword from it
+_DESCRIPTION_LABELS = (
+    (("greet",), ("customer", "hello"), "Greet Customer"),
+    (("take", "order"), (), "Take Coffee Order"),
+    (("finalize", "order"), (), "Finalize Order"),
+    (("clear", "cart"), (), "Clear Cart & End"),
+    (("budget",), (), "Budget Planning"),
+    (("expense", "track"), (), "Track Expenses"),
+    (("savings",), (), "Savings Goals"),
+    (("financial health",), (), "Financial Health Check"),
+)
+# A description can only get a short label if it contains one of these
+_DESCRIPTION_KEYWORDS = tuple(rule[0][0] for rule in _DESCRIPTION_LABELS) + ("end ",)
+
+
+# The helpers below are pure and see the same step IDs and descriptions from
+# several sections of each diagram, so their results are memoized
+@lru_cache(maxsize=1024)
 def sanitize_node_id(node_id: str) -> str:
     """Sanitize node ID for Mermaid diagram."""
     # Handle Mermaid reserved keywords
@@ -39,7 +67,7 @@ def sanitize_node_id(node_id: str) -> str:
         return reserved_keywords[node_id]
 
     # Replace non-alphanumeric characters with underscores
-    sanitized = re.sub(r"[^a-zA-Z0-9_]", "_", node_id)
+    sanitized = _NON_ALNUM_RE.sub("_", node_id)
 
     # Ensure it starts with a letter or underscore
     if sanitized and sanitized[0].isdigit():
@@ -48,6 +76,7 @@ def sanitize_node_id(node_id: str) -> str:
     return sanitized
 
 
+@lru_cache(maxsize=1024)
 def truncate_text(text: str, max_length: int = 35) -> str:
     """Truncate text to fit in diagram nodes."""
     if len(text) <= max_length:
@@ -55,34 +84,27 @@ def truncate_text(text: str, max_length: int = 35) -> str:
     return text[: max_length - 3] + "..."
 
 
+@lru_cache(maxsize=1024)
 def format_description(description: str) -> str:
     """Format description for display in nodes."""
     # Clean up the description
-    description = re.sub(r"\s+", " ", description.strip())
+    description = " ".join(description.split())
 
     # Extract key concepts for better readability
-    if "greet" in description.lower() and (
-        "customer" in description.lower() or "hello" in description.lower()
-    ):
-        return "Greet Customer"
-    elif "take" in description.lower() and "order" in description.lower():
-        return "Take Coffee Order"
-    elif "finalize" in description.lower() and "order" in description.lower():
-        return "Finalize Order"
-    elif "clear" in description.lower() and "cart" in description.lower():
-        return "Clear Cart & End"
-    elif "budget" in description.lower():
-        return "Budget Planning"
-    elif "expense" in description.lower() and "track" in description.lower():
-        return "Track Expenses"
-    elif "savings" in description.lower():
-        return "Savings Goals"
-    elif "financial health" in description.lower():
-        return "Financial Health Check"
-    elif (
-        description.lower().strip().startswith("end ")
-        or "end the conversation" in description.lower()
+    lowered = description.lower()
+    # A single short sentence with no label keyword is already displayable
+    if (
+        len(description) <= 35
+        and "." not in description
+        and not any(k in lowered for k in _DESCRIPTION_KEYWORDS)
     ):
+        return description
+    for required, any_of, label in _DESCRIPTION_LABELS:
+        if all(k in lowered for k in required) and (
+            not any_of or any(k in lowered for k in any_of)
+        ):
+            return label
+    if lowered.strip().startswith("end ") or "end the conversation" in lowered:
         return "End Session"
 
     # Fall back to first sentence
@@ -106,7 +128,8 @@ def get_node_class(step: Dict[str, Any]) -> str:
         return "startStyle"
     elif "budget" in description or "calculate_budget" in tools:
         return "budgetStyle"
-    elif "expense" in description or any("expense" in tool for tool in tools):
+    # "expense" has no space, so it can't match across the joined tool names
+    elif "expense" in description or "expense" in " ".join(tools):
         return "expenseStyle"
     elif "savings" in description or "set_savings_goal" in tools:
         return "savingsStyle"
@@ -122,7 +145,7 @@ def parse_yaml_config(file_path: str) -> Dict[str, Any]:
     """Parse the YAML configuration file."""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAML_LOADER)
     except FileNotFoundError:
         log_error(f"Error: File '{file_path}' not found.")
         raise
@@ -131,10 +154,71 @@ def parse_yaml_config(file_path: str) -> Dict[str, Any]:
         raise ValueError(f"Error parsing YAML: {e}")
 
 
+def _precompute(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the per-step fields shared by every output in a single pass."""
+    node_ids: Dict[str, str] = {}
+    node_classes: Dict[str, str] = {}
+    all_tools: Set[str] = set()
+    total_routes = 0
+    for step in config.get("steps", []):
+        step_id = step["step_id"]
+        node_ids[step_id] = sanitize_node_id(step_id)
+        node_classes[step_id] = get_node_class(step)
+        all_tools.update(step.get("available_tools", []))
+        total_routes += len(step.get("routes", []))
+    return {
+        "node_ids": node_ids,
+        "node_classes": node_classes,
+        "all_tools": all_tools,
+        "total_routes": total_routes,
+    }
+
+
+def _node_definition(
+    step: Dict[str, Any],
+    sanitized_id: str,
+    node_class: str,
+    end_class: str = "endStyle",
+    start_class: str = "startStyle",
+    list_tools: bool = False,
+) -> str:
+    """
+    Render a step's node definition, without indentation.
+
+    :param step: The step config.
+    :param sanitized_id: The step's node ID.
+    :param node_class: The step's node class.
+    :param end_class: Node class drawn as an end node.
+    :param start_class: Node class drawn as a start node.
+    :param list_tools: Name each tool instead of showing a single tool icon.
+    """
+    description = format_description(step.get("description", ""))
+    if node_class == end_class:
+        return f'{sanitized_id}(["🏁 {description}"])'
+    if node_class == start_class:
+        return f'{sanitized_id}["👋 {description}"]'
+    tools = step.get("available_tools", [])
+    if tools:
+        label = " ".join([f"🛠️ {tool}" for tool in tools]) if list_tools else "🛠️"
+        return f'{sanitized_id}["{label} {description}"]'
+    return f'{sanitized_id}["{description}"]'
+
+
 def generate_mermaid_flowchart(
-    config: Dict[str, Any], include_styling: bool = True
+    config: Dict[str, Any],
+    include_styling: bool = True,
+    precomputed: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Generate enhanced Mermaid flowchart from config."""
+    return "\n".join(_mermaid_flowchart_lines(config, include_styling, precomputed))
+
+
+def _mermaid_flowchart_lines(
+    config: Dict[str, Any],
+    include_styling: bool = True,
+    precomputed: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Build the Mermaid flowchart as a list of lines."""
     steps = config.get("steps", [])
     flows = config.get("flows", [])
     start_step = config.get("start_step_id", "start")
@@ -146,13 +230,19 @@ def generate_mermaid_flowchart(
         "",
     ]
 
+    # Node IDs and classes are used by several sections, so resolve them once
+    if precomputed is None:
+        precomputed = _precompute(config)
+    node_ids = precomputed["node_ids"]
+    node_classes = precomputed["node_classes"]
+
     # Add start node
     start_node = sanitize_node_id(start_step)
     mermaid_lines.append(f'    START(["🚀 Start"]) --> {start_node}')
     mermaid_lines.append("")
 
     # Build flow mappings for step categorization
-    flow_step_mapping: Dict[str, List[str]] = {}
+    flow_step_mapping: Dict[str, List[str]] = defaultdict(list)
     flow_info = {}
 
     for flow in flows:
@@ -168,12 +258,12 @@ def generate_mermaid_flowchart(
         exit_steps = flow.get("exits", [])
 
         for step_id in enter_steps + exit_steps:
-            if step_id not in flow_step_mapping:
-                flow_step_mapping[step_id] = []
             flow_step_mapping[step_id].append(flow_id)
 
     # If we have flows, organize by subgraphs
     if flows:
+        # Flow members are looked up by ID instead of scanning all steps
+        step_positions = {step["step_id"]: i for i, step in enumerate(steps)}
         # Track which steps have been added to avoid duplicates
         added_steps = set()
 
@@ -182,45 +272,28 @@ def generate_mermaid_flowchart(
             flow_description = flow_data["description"]
             mermaid_lines.append(f'    subgraph {flow_id}_flow ["{flow_description}"]')
 
-            # Find all steps that belong to this flow
-            flow_steps = []
-
-            # Add enter steps (these are unique to each flow)
-            for step in steps:
-                step_id = step["step_id"]
-                if step_id in flow_data["enters"] and step_id not in added_steps:
-                    flow_steps.append(step)
-                    added_steps.add(step_id)
-
-            # Add exit steps only if they haven't been added to another flow yet
-            for step in steps:
-                step_id = step["step_id"]
-                if step_id in flow_data["exits"] and step_id not in added_steps:
-                    flow_steps.append(step)
-                    added_steps.add(step_id)
-
-            # Add steps to subgraph
-            for step in flow_steps:
-                step_id = step["step_id"]
-                sanitized_id = sanitize_node_id(step_id)
-                description = format_description(step.get("description", ""))
-                tools = step.get("available_tools", [])
-                node_class = get_node_class(step)
-
-                # Create node definition with icons
-                if node_class == "endStyle":
-                    mermaid_lines.append(
-                        f'        {sanitized_id}(["🏁 {description}"])'
-                    )
-                elif node_class == "startStyle":
-                    mermaid_lines.append(f'        {sanitized_id}["👋 {description}"]')
-                elif tools:
-                    tool_icons = "🛠️" if tools else ""
-                    mermaid_lines.append(
-                        f'        {sanitized_id}["{tool_icons} {description}"]'
+            # Add enter steps (these are unique to each flow), then exit steps
+            # only if they haven't been added to another flow yet. Each group
+            # keeps the order of the config's steps
+            for member_ids in (flow_data["enters"], flow_data["exits"]):
+                flow_step_ids = sorted(
+                    {
+                        step_id
+                        for step_id in member_ids
+                        if step_id in step_positions and step_id not in added_steps
+                    },
+                    key=step_positions.__getitem__,
+                )
+                added_steps.update(flow_step_ids)
+
+                # Add steps to subgraph
+                for step_id in flow_step_ids:
+                    node = _node_definition(
+                        steps[step_positions[step_id]],
+                        node_ids[step_id],
+                        node_classes[step_id],
                     )
-                else:
-                    mermaid_lines.append(f'        {sanitized_id}["{description}"]')
+                    mermaid_lines.append(f"        {node}")
 
             mermaid_lines.append("    end")
             mermaid_lines.append("")
@@ -236,23 +309,8 @@ def generate_mermaid_flowchart(
             mermaid_lines.append("    %% Independent Steps")
             for step in orphan_steps:
                 step_id = step["step_id"]
-                sanitized_id = sanitize_node_id(step_id)
-                description = format_description(step.get("description", ""))
-                tools = step.get("available_tools", [])
-                node_class = get_node_class(step)
-
-                # Create node definition with icons
-                if node_class == "endStyle":
-                    mermaid_lines.append(f'    {sanitized_id}(["🏁 {description}"])')
-                elif node_class == "startStyle":
-                    mermaid_lines.append(f'    {sanitized_id}["👋 {description}"]')
-                elif tools:
-                    tool_icons = "🛠️" if tools else ""
-                    mermaid_lines.append(
-                        f'    {sanitized_id}["{tool_icons} {description}"]'
-                    )
-                else:
-                    mermaid_lines.append(f'    {sanitized_id}["{description}"]')
+                node = _node_definition(step, node_ids[step_id], node_classes[step_id])
+                mermaid_lines.append(f"    {node}")
             mermaid_lines.append("")
 
     else:
@@ -261,7 +319,7 @@ def generate_mermaid_flowchart(
         categorized_steps: dict = {"start": [], "core": [], "end": []}
 
         for step in steps:
-            node_class = get_node_class(step)
+            node_class = node_classes[step["step_id"]]
             if node_class in ["start"]:
                 categorized_steps["start"].append(step)
             elif node_class in ["end"]:
@@ -283,31 +341,22 @@ def generate_mermaid_flowchart(
 
             for step in category_steps:
                 step_id = step["step_id"]
-                sanitized_id = sanitize_node_id(step_id)
-                description = format_description(step.get("description", ""))
-                tools = step.get("available_tools", [])
-                node_class = get_node_class(step)
-
-                # Create node definition with icons
-                if node_class == "end":
-                    mermaid_lines.append(f'    {sanitized_id}(["🏁 {description}"])')
-                elif node_class == "start":
-                    mermaid_lines.append(f'    {sanitized_id}["👋 {description}"]')
-                elif tools:
-                    tool_text = " ".join([f"🛠️ {tool}" for tool in tools])
-                    mermaid_lines.append(
-                        f'    {sanitized_id}["{tool_text} {description}"]'
-                    )
-                else:
-                    mermaid_lines.append(f'    {sanitized_id}["{description}"]')
+                node = _node_definition(
+                    step,
+                    node_ids[step_id],
+                    node_classes[step_id],
+                    end_class="end",
+                    start_class="start",
+                    list_tools=True,
+                )
+                mermaid_lines.append(f"    {node}")
 
             mermaid_lines.append("")
 
     # Add routing connections
     mermaid_lines.append("    %% Flow Connections")
     for step in steps:
-        step_id = step["step_id"]
-        sanitized_id = sanitize_node_id(step_id)
+        sanitized_id = node_ids[step["step_id"]]
         routes = step.get("routes", [])
 
         for route in routes:
@@ -318,8 +367,7 @@ def generate_mermaid_flowchart(
             # Simplify condition text
             if condition:
                 # Extract key words from condition
-                condition = condition.replace("User wants ", "")
-                condition = condition.replace("User ", "")
+                condition = _CONDITION_USER_RE.sub("", condition)
                 condition = condition.replace(" or ", "/")
                 condition_text = truncate_text(condition, 25)
                 mermaid_lines.append(
@@ -349,27 +397,27 @@ def generate_mermaid_flowchart(
 
         # Apply classes to nodes
         for step in steps:
-            step_id = sanitize_node_id(step["step_id"])
-            node_class = get_node_class(step)
-            mermaid_lines.append(f"    class {step_id} {node_class}")
+            step_id = step["step_id"]
+            mermaid_lines.append(
+                f"    class {node_ids[step_id]} {node_classes[step_id]}"
+            )
 
-    return "\n".join(mermaid_lines)
+    return mermaid_lines
 
 
-def generate_summary(config: Dict[str, Any]) -> str:
+def generate_summary(
+    config: Dict[str, Any], precomputed: Optional[Dict[str, Any]] = None
+) -> str:
     """Generate a text summary of the agent configuration."""
     name = config.get("name", "Unknown Agent")
     persona = config.get("persona", "No persona defined")
     steps = config.get("steps", [])
     flows = config.get("flows", [])
 
-    # Count tools and routes
-    all_tools = set()
-    total_routes = 0
-    for step in steps:
-        tools = step.get("available_tools", [])
-        all_tools.update(tools)
-        total_routes += len(step.get("routes", []))
+    if precomputed is None:
+        precomputed = _precompute(config)
+    all_tools = precomputed["all_tools"]
+    total_routes = precomputed["total_routes"]
 
     summary_lines = [
         f"# 🤖 Agent Summary: {name.title().replace('_', ' ')}",
@@ -438,7 +486,9 @@ def generate_summary(config: Dict[str, Any]) -> str:
     return "\n".join(summary_lines)
 
 
-def generate_config_json(config: Dict[str, Any]) -> Dict[str, Any]:
+def generate_config_json(
+    config: Dict[str, Any], precomputed: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Generate a JSON representation of the agent configuration with enhanced metadata."""
     steps = config.get("steps", [])
     flows = config.get("flows", [])
@@ -446,16 +496,13 @@ def generate_config_json(config: Dict[str, Any]) -> Dict[str, Any]:
     name = config.get("name", "Unknown Agent")
     persona = config.get("persona", "No persona defined")
 
-    # Count tools and routes
-    all_tools: Set[str] = set()
-    total_routes = 0
-    step_categories = {}
-
-    for step in steps:
-        tools = step.get("available_tools", [])
-        all_tools.update(tools)
-        total_routes += len(step.get("routes", []))
-        step_categories[step["step_id"]] = get_node_class(step)
+    # The step fields are shared with the flowchart and summary below
+    if precomputed is None:
+        precomputed = _precompute(config)
+    all_tools = precomputed["all_tools"]
+    total_routes = precomputed["total_routes"]
+    step_categories = precomputed["node_classes"]
+    node_ids = precomputed["node_ids"]
 
     # Process flows information
     flows_info = []
@@ -482,13 +529,13 @@ def generate_config_json(config: Dict[str, Any]) -> Dict[str, Any]:
             "step_id": step_id,
             "description": description,
             "formatted_description": format_description(description),
-            "category": get_node_class(step),
+            "category": step_categories[step_id],
             "tools": tools,
             "routes": routes,
             "route_count": len(routes),
             "is_start": step_id == start_step,
             "is_end": step_id == "end" or "end" in description.lower(),
-            "sanitized_id": sanitize_node_id(step_id),
+            "sanitized_id": node_ids[step_id],
         }
         enhanced_steps.append(enhanced_step)
 
@@ -498,13 +545,10 @@ def generate_config_json(config: Dict[str, Any]) -> Dict[str, Any]:
         "total_routes": total_routes,
         "total_tools": len(all_tools),
         "total_flows": len(flows),
-        "categories": {},
+        # Count steps by category
+        "categories": dict(Counter(step_categories.values())),
     }
 
-    # Count steps by category
-    for category in step_categories.values():
-        flow_stats["categories"][category] = flow_stats["categories"].get(category, 0) + 1  # type: ignore
-
     # Build the complete configuration JSON
     config_json = {
         "metadata": {
@@ -520,9 +564,9 @@ def generate_config_json(config: Dict[str, Any]) -> Dict[str, Any]:
         "tools": {"available_tools": sorted(list(all_tools)), "tool_usage": {}},  # noqa
         "visualization": {
             "mermaid_flowchart": generate_mermaid_flowchart(
-                config, include_styling=True
+                config, include_styling=True, precomputed=precomputed
             ),
-            "summary_markdown": generate_summary(config),
+            "summary_markdown": generate_summary(config, precomputed),
         },
     }
 
@@ -587,36 +631,41 @@ Examples:
 
     # Generate output
     output_content = []
+    precomputed = _precompute(config)
 
     if args.json:
         # Generate JSON output
-        config_json = generate_config_json(config)
+        config_json = generate_config_json(config, precomputed)
         config_json["metadata"]["generated_at"] = datetime.datetime.now().isoformat()
-        final_output = json.dumps(config_json, indent=2, ensure_ascii=False)
+        output_content.append(json.dumps(config_json, indent=2, ensure_ascii=False))
     else:
         # Generate markdown output
         if args.summary:
-            output_content.append(generate_summary(config))
+            output_content.append(generate_summary(config, precomputed))
             output_content.append("")
 
         # Add mermaid code block wrapper for markdown output
-        mermaid_content = generate_mermaid_flowchart(config, include_styling)
         output_content.append("```mermaid")
-        output_content.append(mermaid_content)
+        output_content.extend(
+            _mermaid_flowchart_lines(config, include_styling, precomputed)
+        )
         output_content.append("```")
-        final_output = "\n".join(output_content)
 
     # Output to file or stdout
     if args.output:
         try:
+            # Write the lines one by one rather than joining the whole output
             with open(args.output, "w", encoding="utf-8") as f:
-                f.write(final_output)
+                for i, line in enumerate(output_content):
+                    if i:
+                        f.write("\n")
+                    f.write(line)
             log_info(f"✅ Enhanced flowchart generated successfully: {args.output}")
         except IOError as e:
             log_error(f"❌ Error writing to file: {e}")
             raise
     else:
-        log_info(final_output)
+        log_info("\n".join(output_content))
 
 
 if __name__ == "__main__":
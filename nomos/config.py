@@ -5,7 +5,7 @@ import importlib.util
 import os
 from typing import Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from pydantic_settings import BaseSettings
 
@@ -25,7 +25,9 @@ class ServerConfig(BaseModel):
     database_url: Optional[str] = None
     enable_tracing: bool = False
     port: int = 8000
-    workers: int = 1
+    workers: int = Field(
+        default_factory=lambda: int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
 
 
 class ExternalTool(BaseModel):
@@ -196,8 +198,10 @@ class AgentConfig(BaseSettings):
         """
         import yaml
 
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(file_path, "r") as file:
-            data = yaml.safe_load(file)
+            data = yaml.load(file, Loader=loader)
         server_data = data.get("server", {})
         if isinstance(server_data, dict):
             expanded = {
@@ -3,12 +3,16 @@
 import os
 import pickle
 import uuid
+import warnings
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from pydantic import BaseModel
+
 from .config import AgentConfig
+from .constants import DEFAULT_PERSONA, DEFAULT_SYSTEM_MESSAGE
 from .llms import LLMBase
 from .memory.base import Memory
-from .memory.flow import FlowMemoryComponent
+from .memory.flow import EmbeddingRetriever, FlowMemoryComponent
 from .models.agent import (
     Action,
     Decision,
@@ -29,7 +33,23 @@ from .models.tool import (
 )
 from .state_machine import StateMachine
 from .utils.flow_utils import create_flows_from_config
-from .utils.logging import log_debug, log_error, pp_response
+from .utils.logging import is_debug_enabled, log_debug, log_error, pp_response
+
+
+def _tool_kwargs(args: BaseModel) -> Dict[str, Any]:
+    """
+    Turn a validated tool arguments model into keyword arguments.
+
+    Flat arguments are read straight off the model; anything nested still goes
+    through `model_dump` so tools keep receiving plain dicts and lists.
+
+    :param args: Tool arguments model from the decision.
+    :return: Keyword arguments for the tool.
+    """
+    kwargs = dict(args)
+    if any(isinstance(v, (BaseModel, dict, list, tuple)) for v in kwargs.values()):
+        return args.model_dump()
+    return kwargs
 
 
 class Session:
@@ -45,7 +65,7 @@ class Session:
         start_step_id: str,
         system_message: Optional[str] = None,
         persona: Optional[str] = None,
-        tools: Optional[List[Union[Callable, ToolWrapper]]] = None,
+        tools: Optional[List[Union[Callable, ToolWrapper, Tool]]] = None,
         flows: Optional[List[Flow]] = None,
         show_steps_desc: bool = False,
         max_errors: int = 3,
@@ -71,7 +91,7 @@ class Session:
         :param state: Optional session state data.
         """
         # Fixed
-        self.session_id = state.session_id if state else f"{name}_{str(uuid.uuid4())}"
+        self.session_id = state.session_id if state else f"{name}_{uuid.uuid4().hex}"
         self.name = name
         self.llm = llm
         self.steps = steps
@@ -98,6 +118,22 @@ class Session:
             else None
         )
         self.tools = get_tools(tools, tool_defs)
+        # Resolve each step's tools once instead of on every decision.
+        # Dispatch goes through a per-step name -> position index into the tuple.
+        self._step_tools: Dict[str, tuple[Tool, ...]] = {}
+        self._step_tool_index: Dict[str, Dict[str, int]] = {}
+        for step_id, step in self.steps.items():
+            step_tools = []
+            for tool in step.tool_ids:
+                _tool = self.tools.get(tool)
+                if not _tool:
+                    log_error(f"Tool '{tool}' not found in session tools. Skipping.")
+                    continue
+                step_tools.append(_tool)
+            self._step_tools[step_id] = tuple(step_tools)
+            self._step_tool_index[step_id] = {
+                _tool.name: i for i, _tool in enumerate(step_tools)
+            }
         # Compile state machine for fast transitions and flow lookups
         self.state_machine = StateMachine(
             self.steps,
@@ -122,23 +158,47 @@ class Session:
         return self.state_machine.memory
 
     def save_session(self) -> None:
-        """Save the current session to disk as a pickle file."""
-        with open(f"{self.session_id}.pkl", "wb") as f:
-            pickle.dump(self, f)
+        """Save the current session state to disk as a JSON file."""
+        with open(f"{self.session_id}.json", "w") as f:
+            f.write(self.get_state().model_dump_json())
         log_debug(f"Session {self.session_id} saved to disk.")
 
     @classmethod
     def load_session(cls, session_id: str) -> "Session":
         """
-        Load a Session from disk by session_id.
+        Load a Session pickled to disk by an earlier version.
+
+        Deprecated: sessions are now saved as JSON states, which
+        `Agent.load_session` rebuilds. This only reads `<session_id>.pkl`.
 
         :param session_id: The session ID string.
         :return: Loaded Session instance.
         """
+        warnings.warn(
+            "Session.load_session only reads pickled sessions and is deprecated; "
+            "use Agent.load_session instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         with open(f"{session_id}.pkl", "rb") as f:
             log_debug(f"Session {session_id} loaded from disk.")
             return pickle.load(f)
 
+    @staticmethod
+    def load_state(session_id: str) -> State:
+        """
+        Load a saved session state from disk by session_id.
+
+        Steps, tools and models are not part of the saved state; use
+        `Agent.load_session` to rebuild a Session around it.
+
+        :param session_id: The session ID string.
+        :return: The saved State.
+        """
+        with open(f"{session_id}.json") as f:
+            log_debug(f"Session {session_id} loaded from disk.")
+            return State.model_validate_json(f.read())
+
     def get_state(self) -> State:
         """
         Get the current session state as a State object.
@@ -161,13 +221,20 @@ class Session:
         :param kwargs: Arguments to pass to the tool.
         :return: Result of the tool execution.
         """
-        tool = self.tools.get(tool_name)
+        step_id = self.current_step.step_id
+        index = self._step_tool_index[step_id].get(tool_name)
+        tool = (
+            self._step_tools[step_id][index]
+            if index is not None
+            else self.tools.get(tool_name)
+        )
         if not tool:
             log_error(f"Tool '{tool_name}' not found in session tools.")
             raise ValueError(
                 f"Tool '{tool_name}' not found in session tools. Please check the tool name."
             )
-        log_debug(f"Running tool: {tool_name} with args: {kwargs}")
+        if is_debug_enabled():
+            log_debug(f"Running tool: {tool_name} with args: {kwargs}")
 
         return tool.run(**kwargs)
 
@@ -177,14 +244,61 @@ class Session:
 
         :return: List of Tool instances available in the current step.
         """
-        tools = []
-        for tool in self.current_step.tool_ids:
-            _tool = self.tools.get(tool)
-            if not _tool:
-                log_error(f"Tool '{tool}' not found in session tools. Skipping.")
+        return self._step_tools[self.current_step.step_id]
+
+    def precompute_next_step(self) -> None:
+        """
+        Warm the per-step caches for the current step and the steps it routes to.
+
+        Intended to run while waiting for user input, so the next decision does
+        not pay for building the decision model or the static system prompt.
+        """
+        system_message = (
+            self.system_message
+            if self.system_message
+            else DEFAULT_SYSTEM_MESSAGE.strip()
+        )
+        persona = self.persona if self.persona else DEFAULT_PERSONA.strip()
+        step_ids = [self.current_step.step_id]
+        step_ids.extend(self.current_step.get_available_routes())
+        for step_id in step_ids:
+            step = self.steps.get(step_id)
+            if step is None:
                 continue
-            tools.append(_tool)
-        return tuple(tools)
+            step_tools = self._step_tools[step_id]
+            self.llm._create_decision_model(
+                current_step=step,
+                current_step_tools=step_tools,
+                constraints=None,
+            )
+            self.llm._get_system_prompt(
+                system_message=system_message,
+                persona=persona,
+                current_step=step,
+                step_tools=step_tools,
+            )
+
+    def record_response(self, user_input: Optional[str], response: Response) -> Response:
+        """
+        Record a RESPOND turn whose decision was made outside of `next`.
+
+        The history gets the same entries `next` adds for a RESPOND turn, so a
+        response replayed from a cache leaves the same state as one from the LLM.
+
+        :param user_input: Optional user input string.
+        :param response: Response holding a RESPOND decision.
+        :return: The recorded response.
+        """
+        if response.decision.action != Action.RESPOND:
+            raise ValueError("Only RESPOND decisions can be recorded.")
+        if user_input:
+            self._add_message("user", user_input)
+        self.state_machine.handle_flow_transitions(
+            self.current_step.step_id, self.session_id
+        )
+        self._add_step_identifier(self.current_step.get_step_identifier())
+        self._add_message(self.name, str(response.decision.response))
+        return response
 
     def _add_message(self, role: str, message: str) -> None:
         """
@@ -205,7 +319,8 @@ class Session:
             # Only update session memory when not in a flow
             self.memory.add(message_obj)
 
-        log_debug(f"{role.title()} added: {message}")
+        if is_debug_enabled():
+            log_debug(f"{role.title()} added: {message}")
 
     def _get_next_decision(
         self, decision_constraints: Optional[DecisionConstraints] = None
@@ -215,6 +330,17 @@ class Session:
 
         :return: The decision made by the LLM.
         """
+        # A deterministic step can only move to its single route, so skip the LLM
+        if self.current_step.deterministic and decision_constraints is None:
+            decision = Decision(
+                reasoning=["Deterministic step with a single route."],
+                action=Action.MOVE,
+                step_id=self.current_step.routes[0].target,
+            )
+            if is_debug_enabled():
+                log_debug(f"Deterministic decision: {decision}")
+            return decision
+
         _decision_model = self.llm._create_decision_model(
             current_step=self.current_step,
             current_step_tools=self._get_current_step_tools(),
@@ -243,7 +369,8 @@ class Session:
 
         # Convert to a Decision model
         decision = self.llm._create_decision_from_output(output=_decision)
-        log_debug(f"Model decision: {decision}")
+        if is_debug_enabled():
+            log_debug(f"Model decision: {decision}")
         return decision
 
     def next(
@@ -268,126 +395,134 @@ class Session:
         :param decision_constraints: Optional constraints for the decision model on retry.
         :return: A tuple containing the decision and any tool results.
         """
-        if no_errors >= self.max_errors:
-            raise ValueError(
-                f"Maximum errors reached ({self.max_errors}). Stopping session."
-            )
-        if next_count >= self.max_iter:
-            if not self.current_step.auto_flow:
-                self._add_message(
-                    "fallback",
-                    (
-                        "Maximum iterations reached. Inform the user and based on the "
-                        "available context, produce a fallback response."
-                    ),
+        # Follow-up decisions (retries, after tool calls and moves) loop here
+        # rather than recursing; they take no user input and default return flags.
+        first = True
+        while True:
+            if not first:
+                user_input = None
+                return_tool = return_step = False
+            first = False
+
+            if no_errors >= self.max_errors:
+                raise ValueError(
+                    f"Maximum errors reached ({self.max_errors}). Stopping session."
                 )
-                return self.next(
-                    verbose=verbose,
-                    decision_constraints=DecisionConstraints(
+            if next_count >= self.max_iter:
+                if not self.current_step.auto_flow:
+                    self._add_message(
+                        "fallback",
+                        (
+                            "Maximum iterations reached. Inform the user and based on the "
+                            "available context, produce a fallback response."
+                        ),
+                    )
+                    no_errors, next_count = 0, 0
+                    decision_constraints = DecisionConstraints(
                         actions=["RESPOND"], fields=["response"]
-                    ),
-                )
-            else:
-                raise RecursionError(
-                    f"Maximum iterations reached ({self.max_iter}). Stopping session."
-                )
-
-        log_debug(f"User input received: {user_input}")
-        self._add_message("user", user_input) if user_input else None
-        log_debug(f"Current step: {self.current_step.step_id}")
+                    )
+                    continue
+                else:
+                    raise RecursionError(
+                        f"Maximum iterations reached ({self.max_iter}). Stopping session."
+                    )
 
-        # Check for flow transitions
-        self.state_machine.handle_flow_transitions(
-            self.current_step.step_id, self.session_id, verbose=verbose
-        )
+            log_debug(f"User input received: {user_input}")
+            self._add_message("user", user_input) if user_input else None
+            log_debug(f"Current step: {self.current_step.step_id}")
 
-        decision = self._get_next_decision(decision_constraints=decision_constraints)
-        log_debug(str(decision))
-        log_debug(f"Action decided: {decision.action}")
+            # Check for flow transitions
+            self.state_machine.handle_flow_transitions(
+                self.current_step.step_id, self.session_id, verbose=verbose
+            )
 
-        # Validate decision
-        if decision.action == Action.RESPOND and decision.response is None:
-            self._add_message(
-                "error", "RESPOND action requires a response, but none was provided."
+            decision = self._get_next_decision(
+                decision_constraints=decision_constraints
             )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(
+            if is_debug_enabled():
+                log_debug(str(decision))
+                log_debug(f"Action decided: {decision.action}")
+
+            # Validate decision
+            if decision.action == Action.RESPOND and decision.response is None:
+                self._add_message(
+                    "error",
+                    "RESPOND action requires a response, but none was provided.",
+                )
+                no_errors += 1
+                next_count += 1
+                decision_constraints = DecisionConstraints(
                     actions=["RESPOND"], fields=["response"]
-                ),
-                verbose=verbose,
-            )
-        if decision.action == Action.MOVE and decision.step_id is None:
-            self._add_message(
-                "error", "MOVE action requires a step_id, but none was provided."
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(
+                )
+                continue
+            if decision.action == Action.MOVE and decision.step_id is None:
+                self._add_message(
+                    "error", "MOVE action requires a step_id, but none was provided."
+                )
+                no_errors += 1
+                next_count += 1
+                decision_constraints = DecisionConstraints(
                     actions=["MOVE"], fields=["step_id"]
-                ),
-                verbose=verbose,
-            )
-        if decision.action == Action.TOOL_CALL and decision.tool_call is None:
-            self._add_message(
-                "error", "TOOL_CALL action requires a tool_call, but none was provided."
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                decision_constraints=DecisionConstraints(
+                )
+                continue
+            if decision.action == Action.TOOL_CALL and decision.tool_call is None:
+                self._add_message(
+                    "error",
+                    "TOOL_CALL action requires a tool_call, but none was provided.",
+                )
+                no_errors += 1
+                next_count += 1
+                decision_constraints = DecisionConstraints(
                     actions=["TOOL_CALL"], fields=["tool_call"]
-                ),
-                verbose=verbose,
-            )
+                )
+                continue
 
-        self._add_step_identifier(self.current_step.get_step_identifier())
-        if decision.action == Action.RESPOND:
-            self._add_message(self.name, str(decision.response))
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            return res
-        elif decision.action == Action.TOOL_CALL and decision.tool_call:
-            _error: Optional[Exception] = None
-            tool_results = None
-            try:
-                tool_name = decision.tool_call.tool_name  # type: ignore
-                tool_kwargs: dict = decision.tool_call.tool_kwargs.model_dump()
-                log_debug(f"Running tool: {tool_name} with args: {tool_kwargs}")
+            self._add_step_identifier(self.current_step.get_step_identifier())
+            if decision.action == Action.RESPOND:
+                self._add_message(self.name, str(decision.response))
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                return res
+            elif decision.action == Action.TOOL_CALL and decision.tool_call:
+                _error: Optional[Exception] = None
+                tool_results = None
                 try:
-                    tool_results = self._run_tool(tool_name, tool_kwargs)
-                    self._add_message(
-                        "tool",
-                        f"Tool {tool_name} executed successfully with args {tool_kwargs}.\nResults: {tool_results}",
-                    )
+                    tool_name = decision.tool_call.tool_name  # type: ignore
+                    tool_kwargs = _tool_kwargs(decision.tool_call.tool_kwargs)
+                    if is_debug_enabled():
+                        log_debug(f"Running tool: {tool_name} with args: {tool_kwargs}")
+                    try:
+                        tool_results = self._run_tool(tool_name, tool_kwargs)
+                        self._add_message(
+                            "tool",
+                            f"Tool {tool_name} executed successfully with args {tool_kwargs}.\nResults: {tool_results}",
+                        )
+                    except Exception as e:
+                        self._add_message(
+                            "tool", f"Running tool {tool_name} with args {tool_kwargs}"
+                        )
+                        raise e
+                    if is_debug_enabled():
+                        log_debug(f"Tool Results: {tool_results}")
+                except FallbackError as e:
+                    _error = e
+                    self._add_message("fallback", str(e))
+                except InvalidArgumentsError as e:
+                    _error = e
+                    self._add_message("error", str(e))
                 except Exception as e:
-                    self._add_message(
-                        "tool", f"Running tool {tool_name} with args {tool_kwargs}"
-                    )
-                    raise e
-                log_debug(f"Tool Results: {tool_results}")
-            except FallbackError as e:
-                _error = e
-                self._add_message("fallback", str(e))
-            except InvalidArgumentsError as e:
-                _error = e
-                self._add_message("error", str(e))
-            except Exception as e:
-                _error = e
-                self._add_message("error", str(e))
-
-            res = Response(decision=decision, tool_output=tool_results)
-            if verbose:
-                pp_response(res)
-            if return_tool and _error is None:
-                return res
-            return self.next(
-                no_errors=no_errors + 1 if _error else 0,
-                next_count=next_count + 1,
-                decision_constraints=(
+                    _error = e
+                    self._add_message("error", str(e))
+
+                res = Response(decision=decision, tool_output=tool_results)
+                if verbose:
+                    pp_response(res)
+                if return_tool and _error is None:
+                    return res
+                no_errors = no_errors + 1 if _error else 0
+                next_count += 1
+                decision_constraints = (
                     DecisionConstraints(
                         actions=["TOOL_CALL"],
                         fields=["tool_call"],
@@ -399,88 +534,91 @@ class Session:
                         and decision.tool_call
                     )
                     else None
-                ),
-                verbose=verbose,
-            )
-        elif decision.action == Action.MOVE and decision.step_id:
-            _error = None
-            if self.state_machine.can_transition(
-                self.state_machine.current_step_id, decision.step_id
-            ):
-                # Check if we need to exit current flow before moving
-                if self.state_machine.current_flow and self.state_machine.flow_context:
-                    _, exits = self.state_machine.get_flow_transitions(
-                        self.state_machine.current_step_id
-                    )
-                    if self.state_machine.current_flow.flow_id in exits:
-                        self.state_machine._exit_flow(
+                )
+                continue
+            elif decision.action == Action.MOVE and decision.step_id:
+                _error = None
+                if self.state_machine.can_transition(
+                    self.state_machine.current_step_id, decision.step_id
+                ):
+                    # Check if we need to exit current flow before moving
+                    if (
+                        self.state_machine.current_flow
+                        and self.state_machine.flow_context
+                    ):
+                        _, exits = self.state_machine.get_flow_transitions(
                             self.state_machine.current_step_id
                         )
+                        if self.state_machine.current_flow.flow_id in exits:
+                            self.state_machine._exit_flow(
+                                self.state_machine.current_step_id
+                            )
 
-                self.state_machine.move(decision.step_id)
-                log_debug(f"Moving to next step: {self.state_machine.current_step_id}")
-                self._add_step_identifier(self.current_step.get_step_identifier())
+                    self.state_machine.move(decision.step_id)
+                    log_debug(
+                        f"Moving to next step: {self.state_machine.current_step_id}"
+                    )
+                    self._add_step_identifier(self.current_step.get_step_identifier())
 
-            else:
-                allowed = self.state_machine.transitions.get(
-                    self.state_machine.current_step_id, []
+                else:
+                    allowed = self.state_machine.transitions.get(
+                        self.state_machine.current_step_id, []
+                    )
+                    self._add_message(
+                        "error",
+                        f"Invalid route: {decision.step_id} not in {allowed}",
+                    )
+                    _error = ValueError(
+                        f"Invalid route: {decision.step_id} not in {allowed}"
+                    )
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                if return_step:
+                    self.state_machine.handle_flow_transitions(
+                        self.state_machine.current_step_id,
+                        self.session_id,
+                        verbose=verbose,
+                    )
+                    return res
+                no_errors = no_errors + 1 if _error else 0
+                next_count += 1
+                decision_constraints = (
+                    DecisionConstraints(actions=["MOVE"], fields=["step_id"])
+                    if _error
+                    else None
                 )
+                continue
+            elif decision.action == Action.END:
+                # Clean up any active flows before ending
+                if self.state_machine.current_flow and self.state_machine.flow_context:
+                    try:
+                        self.state_machine.current_flow.cleanup(
+                            self.state_machine.flow_context
+                        )
+                        log_debug(
+                            f"Cleaned up flow '{self.state_machine.current_flow.flow_id}' on session end"
+                        )
+                    except Exception as e:
+                        log_error(f"Error cleaning up flow on session end: {e}")
+                    finally:
+                        self.state_machine.current_flow = None
+                        self.state_machine.flow_context = None
+
+                self._add_message("end", "Session ended.")
+                res = Response(decision=decision)
+                if verbose:
+                    pp_response(res)
+                return res
+            else:
                 self._add_message(
                     "error",
-                    f"Invalid route: {decision.step_id} not in {allowed}",
-                )
-                _error = ValueError(
-                    f"Invalid route: {decision.step_id} not in {allowed}"
+                    f"Unknown action: {decision.action}. Please check the action type.",
                 )
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            if return_step:
-                self.state_machine.handle_flow_transitions(
-                    self.state_machine.current_step_id, self.session_id, verbose=verbose
-                )
-                return res
-            return self.next(
-                no_errors=no_errors + 1 if _error else 0,
-                next_count=next_count + 1,
-                decision_constraints=(
-                    DecisionConstraints(actions=["MOVE"], fields=["step_id"])
-                    if _error
-                    else None
-                ),
-                verbose=verbose,
-            )
-        elif decision.action == Action.END:
-            # Clean up any active flows before ending
-            if self.state_machine.current_flow and self.state_machine.flow_context:
-                try:
-                    self.state_machine.current_flow.cleanup(
-                        self.state_machine.flow_context
-                    )
-                    log_debug(
-                        f"Cleaned up flow '{self.state_machine.current_flow.flow_id}' on session end"
-                    )
-                except Exception as e:
-                    log_error(f"Error cleaning up flow on session end: {e}")
-                finally:
-                    self.state_machine.current_flow = None
-                    self.state_machine.flow_context = None
-
-            self._add_message("end", "Session ended.")
-            res = Response(decision=decision)
-            if verbose:
-                pp_response(res)
-            return res
-        else:
-            self._add_message(
-                "error",
-                f"Unknown action: {decision.action}. Please check the action type.",
-            )
-            return self.next(
-                no_errors=no_errors + 1,
-                next_count=next_count + 1,
-                verbose=verbose,
-            )
+                no_errors += 1
+                next_count += 1
+                decision_constraints = None
+                continue
 
     def _add_step_identifier(self, step_identifier: StepIdentifier) -> None:
         """
@@ -603,6 +741,16 @@ class Agent:
                         f"Tool {step_tool} not found in tools for step {step.step_id}\nAvailable tools: {self.tools}"
                     )
 
+        # Build the Tool objects once so every session shares them
+        self._tools = get_tools(
+            self.tools,
+            (
+                self.config.tools.tool_defs
+                if self.config and self.config.tools.tool_defs
+                else None
+            ),
+        )
+
         # Go through all the steps and if there are examples in them, perform batch embedding
         for step in self.steps.values():
             if step.examples:
@@ -661,6 +809,41 @@ class Agent:
                     "NOMOS_LOG_LEVEL", logging_config.handlers[0].level.upper()
                 )
 
+    def warmup(self) -> None:
+        """
+        Pay one-time start-up costs before the first turn instead of during it.
+
+        Builds the decision model for every step and embeds a short text with
+        the agent's embedding model and each flow memory's embedding retriever,
+        so model clients and their connections are ready.
+        """
+        for step in self.steps.values():
+            self.llm._create_decision_model(
+                current_step=step,
+                current_step_tools=tuple(
+                    self._tools[tool] for tool in step.tool_ids if tool in self._tools
+                ),
+                constraints=None,
+            )
+
+        embedding_models = [self.embedding_model]
+        for flow in self.flows or []:
+            flow_memory = flow.get_memory()
+            if isinstance(flow_memory, FlowMemoryComponent) and isinstance(
+                flow_memory.memory.retriever, EmbeddingRetriever
+            ):
+                embedding_models.append(flow_memory.memory.retriever.embedding_model)
+
+        warmed = set()
+        for model in embedding_models:
+            if id(model) in warmed:
+                continue
+            warmed.add(id(model))
+            try:
+                model.embed_text("warmup")
+            except NotImplementedError:
+                log_debug(f"{type(model).__name__} does not support embeddings")
+
     def create_session(self, memory: Optional[Memory] = None) -> Session:
         """
         Create a new Session for this agent.
@@ -683,7 +866,7 @@ class Agent:
             start_step_id=self.start,
             system_message=self.system_message,
             persona=self.persona,
-            tools=self.tools,
+            tools=list(self._tools.values()),
             flows=list(self.flows) if self.flows else None,
             show_steps_desc=self.show_steps_desc,
             max_errors=self.max_errors,
@@ -700,7 +883,7 @@ class Agent:
         :return: Loaded Session instance.
         """
         log_debug(f"Loading session {session_id}")
-        return Session.load_session(session_id)
+        return self.get_session_from_state(Session.load_state(session_id))
 
     def get_session_from_state(self, state: State) -> Session:
         """
@@ -709,7 +892,8 @@ class Agent:
         :param state: The session state
         :return: Session instance.
         """
-        log_debug(f"Creating session from state: {state}")
+        if is_debug_enabled():
+            log_debug(f"Creating session from state: {state}")
 
         memory = (
             self.config.memory.get_memory()
@@ -721,7 +905,7 @@ class Agent:
             name=self.name,
             llm=self.llm,
             memory=memory,
-            tools=self.tools,
+            tools=list(self._tools.values()),
             config=self.config,
             embedding_model=self.embedding_model,
             persona=self.persona,
@@ -1,6 +1,6 @@
 """LLMBase class for Nomos agent framework."""
 
-from functools import cache
+from functools import cache, lru_cache
 from typing import Dict, List, Literal, Optional, Type, Union
 
 from pydantic import BaseModel
@@ -75,39 +75,76 @@ class LLMBase:
         :return: String representation of the history.
         """
         history_str = []
-        # log_debug(f"Formatting chat history: {history}")
+        # Only the trailing run of errors matters, so scan back from the end
+        # instead of walking the whole history
         n_last_consecutive_errors = 0
-        for item in history:
+        for item in reversed(history):
             if isinstance(item, Message):
-                if item.role == "error":
-                    n_last_consecutive_errors += 1
-                else:
-                    n_last_consecutive_errors = 0
+                if item.role != "error":
+                    break
+                n_last_consecutive_errors += 1
             elif isinstance(item, Step):
-                n_last_consecutive_errors = 0
+                break
         if n_last_consecutive_errors > max_errors:
             log_error(
                 f"Too many consecutive errors in history. Only showing the last {max_errors} errors out of  {n_last_consecutive_errors}"
             )
+        skip_errors_before = (
+            len(history) - max_errors
+            if n_last_consecutive_errors > max_errors
+            else 0
+        )
+        last = len(history) - 1
         for i, item in enumerate(history):
-            # If the error message is not within the last max_errors, skip it
-            if (
-                isinstance(item, Message)
-                and item.role == "error"
-                and n_last_consecutive_errors > max_errors
-                and i < len(history) - max_errors
-            ):
-                continue
-            # If the fallback message is not the last one in the history, skip it
-            if (
-                isinstance(item, Message)
-                and item.role == "fallback"
-                and i < len(history) - 1
-            ):
-                continue
+            if isinstance(item, Message):
+                # If the error message is not within the last max_errors, skip it
+                if item.role == "error" and i < skip_errors_before:
+                    continue
+                # If the fallback message is not the last one in the history, skip it
+                if item.role == "fallback" and i < last:
+                    continue
             history_str.append(str(item))
         return "\n".join(history_str)
 
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _get_system_prompt(
+        cls,
+        system_message: str,
+        persona: str,
+        current_step: Step,
+        step_tools: tuple[Tool, ...],
+    ) -> str:
+        """
+        Build the static part of the system prompt for a step.
+
+        The result only depends on its arguments, so it is compiled once per
+        step and stays byte-identical across turns, which keeps the prompt
+        prefix cacheable on the provider side.
+
+        :param system_message: System prompt.
+        :param persona: Agent persona.
+        :param current_step: Current step.
+        :param step_tools: Tools available in the current step.
+        :return: System prompt without the step examples.
+        """
+        # Collect every line into one buffer and join once
+        parts = [
+            system_message,
+            persona,
+            "",
+            f"Instructions: {current_step.description.strip()}",
+        ]
+        if current_step.routes:
+            parts.append("Available Routes:")
+            parts.append(cls.get_routes_desc(current_step))
+        if current_step.tool_ids:
+            parts.append("\nAvailable Tools:")
+            tools_by_name = {tool.name: tool for tool in step_tools}
+            parts.append(cls.get_tools_desc(tools_by_name, list(tools_by_name)))
+        parts.append("")
+        return "\n".join(parts)
+
     def get_messages(
         self,
         current_step: Step,
@@ -129,33 +166,32 @@ class LLMBase:
         :return: List of Message objects.
         """
         messages = []
-        system_prompt = system_message + "\n"
-        system_prompt += f"{persona}\n\n"
-        system_prompt += f"Instructions: {current_step.description.strip()}\n"
-        system_prompt += (
-            f"Available Routes:\n{self.get_routes_desc(current_step)}\n"
-            if current_step.routes
-            else ""
-        )
-        system_prompt += (
-            f"\nAvailable Tools:\n{self.get_tools_desc(tools, current_step.tool_ids)}\n"
-            if current_step.tool_ids
-            else ""
+        system_prompt = self._get_system_prompt(
+            system_message=system_message,
+            persona=persona,
+            current_step=current_step,
+            step_tools=tuple(
+                tools[tool_name]
+                for tool_name in current_step.tool_ids
+                if tool_name in tools
+            ),
         )
+        # Rendered once: both the example retrieval and the user prompt need it
+        formatted_history = self.format_history(history)
         if current_step.examples:
             example_str = ["\nExamples:"]
             for i, example in enumerate(
                 current_step.get_examples(
                     embedding_model=embedding_model or self,
                     similarity_fn=self.text_similarity,
-                    context_emb=self.embed_text(self.format_history(history)),
+                    context_emb=self.embed_text(formatted_history),
                     max_examples=max_examples,
                 )
             ):
                 example_str.append(f"{i + 1}. {str(example)}")
             system_prompt += "\n".join(example_str) + "\n"
 
-        user_prompt = f"History:\n{self.format_history(history)}"
+        user_prompt = f"History:\n{formatted_history}"
 
         messages.append(Message(role="system", content=system_prompt))
         messages.append(Message(role="user", content=user_prompt))
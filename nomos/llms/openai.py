@@ -58,7 +58,10 @@ class OpenAI(LLMBase):
             response_format=response_format,
             **kwargs,
         )
-        return comp.choices[0].message.parsed
+        message = comp.choices[0].message
+        if message.parsed is None:
+            raise ValueError(f"OpenAI returned no structured output: {message.refusal}")
+        return message.parsed
 
     def generate(
         self,
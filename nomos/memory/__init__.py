@@ -28,7 +28,7 @@ class MemoryConfig(BaseModel):
         :return: An instance of the specified memory management.
         """
         if self.type == "base":
-            return Memory()
+            return Memory(**(self.kwargs or {}))
         elif self.type == "summarization":
             _kwargs = self.kwargs.copy() if self.kwargs else {}
             _kwargs["llm"] = LLMConfig(
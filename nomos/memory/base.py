@@ -2,7 +2,7 @@
 
 import os
 import pickle
-from typing import List, Union
+from typing import List, Optional, Union
 
 from nomos.models.agent import Message, StepIdentifier, Summary
 
@@ -10,14 +10,31 @@ from nomos.models.agent import Message, StepIdentifier, Summary
 class Memory:
     """Base class for memory modules."""
 
-    def __init__(self) -> None:
-        """Initialize memory."""
+    def __init__(self, max_items: Optional[int] = None) -> None:
+        """
+        Initialize memory.
+
+        :param max_items: Number of most recent items to keep. The oldest items
+            are dropped in batches, so the history can briefly hold up to a
+            quarter more. Defaults to `NOMOS_HISTORY_MAX`, or unbounded when
+            that is not set.
+        """
+        if max_items is None and os.getenv("NOMOS_HISTORY_MAX"):
+            max_items = int(os.environ["NOMOS_HISTORY_MAX"])
+        self.max_items = max_items
         self.context: List[Union[Message, StepIdentifier, Summary]] = []
 
     def add(self, item: Union[Message, StepIdentifier]) -> None:
         """Add an item to memory."""
         self.context.append(item)
         self.optimize()
+        # Drop the oldest items so the history (and the prompt) stays bounded.
+        # Trimming only once the slack is used up keeps each add O(1) amortized
+        # instead of shifting the whole list on every add.
+        if self.max_items and len(self.context) > self.max_items + max(
+            1, self.max_items // 4
+        ):
+            del self.context[: len(self.context) - self.max_items]
 
     def clear(self) -> None:
         """Clear all items from memory."""
@@ -110,6 +110,7 @@ class Step(BaseModel):
         answer_model (Optional[Dict[str, Dict[str, Any]]]): Pydantic model for the agent's answer structure.
         auto_flow (bool): Flag indicating if the step should automatically flow without additonal inputs or answering.
         provide_suggestions (bool): Flag indicating if the step should provide suggestions to the user.
+        deterministic (bool): Flag indicating the step always moves to its only route without asking the LLM.
     Methods:
         get_available_routes() -> List[str]: Get the list of available route targets.
     """
@@ -121,6 +122,7 @@ class Step(BaseModel):
     answer_model: Optional[Union[Dict[str, Dict[str, Any]], BaseModel]] = None
     auto_flow: bool = False
     quick_suggestions: bool = False
+    deterministic: bool = False
     flow_id: Optional[str] = None  # Add this to associate steps with flows
     examples: Optional[List[DecisionExample]] = None
 
@@ -138,6 +140,10 @@ class Step(BaseModel):
             raise ValueError(
                 f"Step '{self.step_id}': When auto_flow is True, quick_suggestions cannot be True"
             )
+        if self.deterministic and (len(self.routes) != 1 or self.available_tools):
+            raise ValueError(
+                f"Step '{self.step_id}': When deterministic is True, the step must have exactly one route and no tools"
+            )
 
     def get_answer_model(self) -> BaseModel:
         """
@@ -283,7 +289,7 @@ class FlowState(BaseModel):
 class State(BaseModel):
     """Container for session data required by ``Agent.next``."""
 
-    session_id: str = Field(default_factory=lambda: str(uuid4()))
+    session_id: str = Field(default_factory=lambda: uuid4().hex)
     current_step_id: str
     history: List[Union[Summary, Message, StepIdentifier]] = Field(default_factory=list)
     flow_state: Optional[FlowState] = None
@@ -355,24 +355,28 @@ class ToolWrapper(BaseModel):
 
 
 def get_tools(
-    tools: Optional[list[Union[Callable, ToolWrapper]]],
+    tools: Optional[list[Union[Callable, ToolWrapper, Tool]]],
     tool_defs: Optional[Dict[str, ToolDef]] = None,
 ) -> dict[str, Tool]:
     """
     Get a list of Tool instances from a list of functions or tool identifiers.
 
-    :param tools: A list of functions or tool identifiers.
+    :param tools: A list of functions, tool identifiers or already built Tool instances.
     :param tool_defs: Optional dictionary of tool definitions for argument descriptions.
     :return: A dictionary mapping tool names to Tool instances.
     """
     _tools: dict[str, Tool] = {}
     for tool in tools or []:
         _tool = None
-        if callable(tool):
+        if isinstance(tool, Tool):
+            _tool = tool
+        elif callable(tool):
             _tool = Tool.from_function(tool, tool_defs)
         if isinstance(tool, ToolWrapper):
             _tool = tool.get_tool(tool_defs)
-        assert _tool is not None, "Tool must be a callable or a ToolWrapper instance"
+        assert (
+            _tool is not None
+        ), "Tool must be a callable, a ToolWrapper or a Tool instance"
         _tools[_tool.name] = _tool
     return _tools
 
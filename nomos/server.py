@@ -14,7 +14,16 @@ def run_server(config_path: Path, port: int = 8000, workers: int = 1) -> None:
         )
 
     os.environ["CONFIG_PATH"] = str(config_path)
-    uvicorn.run("nomos.api.app:app", host="0.0.0.0", port=port, workers=workers)
+    # "auto" picks uvloop and httptools (installed with the serve extra) when
+    # they are importable and falls back to asyncio and h11 otherwise
+    uvicorn.run(
+        "nomos.api.app:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
 
 
 __all__ = ["run_server"]
@@ -73,7 +73,8 @@ class TestSuite(BaseModel):
 def load_yaml_tests(path: Union[str, Path]) -> TestSuite:
     """Load a TestSuite from YAML file."""
     with open(path, "r") as f:
-        data = yaml.safe_load(f)
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     return TestSuite(**(data or {}))
 
 
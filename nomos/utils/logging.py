@@ -35,14 +35,33 @@ def get_logger() -> Logger:
     return logger
 
 
+@lru_cache(maxsize=None)
+def is_enabled_for(level: str) -> bool:
+    """Check whether messages at `level` are emitted, so formatting can be skipped."""
+    get_logger()
+    if os.getenv("NOMOS_ENABLE_LOGGING", "false").lower() != "true":
+        return False
+    min_level = os.getenv("NOMOS_LOG_LEVEL", "INFO").upper()
+    return logger.level(min_level).no <= logger.level(level.upper()).no
+
+
+def is_debug_enabled() -> bool:
+    """Check whether debug messages are emitted."""
+    return is_enabled_for("DEBUG")
+
+
 def log_debug(message: str) -> None:
     """Log a debug message."""
+    if not is_enabled_for("DEBUG"):
+        return
     logger = get_logger()
     logger.debug(message)
 
 
 def log_info(message: str) -> None:
     """Log an info message."""
+    if not is_enabled_for("INFO"):
+        return
     logger = get_logger()
     logger.info(message)
 
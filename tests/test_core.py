@@ -1,6 +1,7 @@
 """Tests for core Nomos agent functionality."""
 
 import os
+import pickle
 import sys
 import pytest
 from unittest.mock import patch, MagicMock
@@ -15,8 +16,9 @@ from nomos.models.agent import (
     Step,
     Route,
     Decision,
+    Response,
 )
-from nomos.core import Agent, Session
+from nomos.core import Agent, Session, _tool_kwargs
 from nomos.config import AgentConfig, ToolsConfig
 from nomos.models.tool import Tool, ToolWrapper, ToolDef, ArgDef
 
@@ -37,6 +39,69 @@ def test_session_creation(basic_agent):
     assert len(session.memory.context) == 0
 
 
+def test_sessions_share_tools(basic_agent):
+    """Test that sessions reuse the Tool objects built by the agent."""
+    session_a = basic_agent.create_session()
+    session_b = basic_agent.create_session()
+    for name, tool in session_a.tools.items():
+        assert session_b.tools[name] is tool
+    assert session_a._get_current_step_tools() is session_a._get_current_step_tools()
+
+
+def test_system_prompt_compiled_once(basic_agent):
+    """Test that the static system prompt is reused across turns and sessions."""
+    session_a = basic_agent.create_session()
+    session_b = basic_agent.create_session()
+    kwargs = dict(
+        current_step=session_a.current_step,
+        history=[],
+        system_message="System",
+        persona="Persona",
+    )
+    prompt_a = basic_agent.llm.get_messages(tools=session_a.tools, **kwargs)[0]
+    prompt_b = basic_agent.llm.get_messages(tools=session_b.tools, **kwargs)[0]
+    assert prompt_a.content == prompt_b.content
+    assert prompt_a.content.startswith("System\nPersona\n\nInstructions:")
+    info = basic_agent.llm._get_system_prompt.cache_info()
+    assert info.hits >= 1
+
+
+def test_precompute_next_step_warms_caches(basic_agent):
+    """Test that precomputing the next step fills the decision model cache."""
+    session = basic_agent.create_session()
+    session.precompute_next_step()
+    before = basic_agent.llm._create_decision_model.cache_info()
+    session.llm._create_decision_model(
+        current_step=session.current_step,
+        current_step_tools=session._get_current_step_tools(),
+        constraints=None,
+    )
+    after = basic_agent.llm._create_decision_model.cache_info()
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses
+
+
+def test_agent_warmup(basic_agent):
+    """Test that warmup builds decision models and touches the embedding model."""
+    with patch.object(
+        basic_agent.embedding_model,
+        "embed_text",
+        wraps=basic_agent.embedding_model.embed_text,
+    ) as embed_text:
+        basic_agent.warmup()
+    embed_text.assert_called_once_with("warmup")
+
+    session = basic_agent.create_session()
+    before = basic_agent.llm._create_decision_model.cache_info()
+    basic_agent.llm._create_decision_model(
+        current_step=session.current_step,
+        current_step_tools=session._get_current_step_tools(),
+        constraints=None,
+    )
+    after = basic_agent.llm._create_decision_model.cache_info()
+    assert after.hits == before.hits + 1
+
+
 def test_tool_registration(basic_agent, test_tool_0):
     """Test that tools are properly registered and converted to Tool objects."""
     tool_name = test_tool_0.__name__
@@ -110,6 +175,84 @@ def test_basic_conversation_flow(basic_agent, test_tool_0, test_tool_1, tool_def
     assert res.decision.response == "I can help you with that."
 
 
+def test_next_follows_tool_calls_without_recursion(basic_agent):
+    """Test that a tool call and the follow-up response are handled in one call."""
+    session = basic_agent.create_session()
+    decision_model = basic_agent.llm._create_decision_model(
+        current_step=session.current_step,
+        current_step_tools=session._get_current_step_tools(),
+    )
+    session.llm.set_response(
+        decision_model(
+            reasoning=["Use the tool"],
+            action=Action.TOOL_CALL.value,
+            tool_call={"tool_name": "test_tool", "tool_kwargs": {"arg0": "x"}},
+        )
+    )
+    session.llm.set_response(
+        decision_model(
+            reasoning=["Report"], action=Action.RESPOND.value, response="Done"
+        ),
+        append=True,
+    )
+
+    with patch.object(session, "next", wraps=session.next) as next_mock:
+        res = session.next("Use the tool")
+
+    assert next_mock.call_count == 1
+    assert res.decision.response == "Done"
+    roles = [getattr(msg, "role", None) for msg in session.memory.context]
+    assert "tool" in roles
+
+
+def test_deterministic_step_skips_llm(mock_llm):
+    """Test that a deterministic step moves to its only route without the LLM."""
+    steps = [
+        Step(
+            step_id="start",
+            description="Start step",
+            routes=[Route(target="chat", condition="always")],
+            deterministic=True,
+        ),
+        Step(step_id="chat", description="Chat step"),
+    ]
+    agent = Agent(llm=mock_llm, name="pass_through", steps=steps, start_step_id="start")
+    session = agent.create_session()
+    decision_model = mock_llm._create_decision_model(
+        current_step=agent.steps["chat"], current_step_tools=()
+    )
+    mock_llm.set_response(
+        decision_model(reasoning=["Greet"], action="RESPOND", response="Hi")
+    )
+
+    with patch.object(mock_llm, "get_output", wraps=mock_llm.get_output) as output:
+        res = session.next("Hello")
+
+    assert output.call_count == 1
+    assert session.current_step.step_id == "chat"
+    assert res.decision.response == "Hi"
+
+    with pytest.raises(ValueError, match="deterministic"):
+        Step(step_id="bad", description="Bad step", deterministic=True)
+
+
+def test_tool_kwargs_flat_and_nested():
+    """Test that tool kwargs skip model_dump only when the arguments are flat."""
+    from nomos.utils.utils import create_base_model
+
+    flat = create_base_model("FlatArgs", {"a": {"type": int}, "b": {"type": str}})
+    kwargs = _tool_kwargs(flat(a=1, b="x"))
+    assert kwargs == {"a": 1, "b": "x"}
+
+    nested = create_base_model(
+        "NestedArgs",
+        {"inner": {"type": {"name": "Inner", "params": {"c": {"type": int}}}}},
+    )
+    kwargs = _tool_kwargs(nested(inner={"c": 2}))
+    assert kwargs == {"inner": {"c": 2}}
+    assert type(kwargs["inner"]) is dict
+
+
 def test_tool_usage(basic_agent, test_tool_0, test_tool_1, tool_defs):
     """Test that the agent can properly use tools."""
 
@@ -579,6 +722,22 @@ class TestMemoryOperations:
         assert len(step_ids) == 1
         assert step_ids[0].step_id == "test_step"
 
+    def test_record_response_matches_next(self, basic_agent):
+        """Test that a recorded response leaves the same history as `next`."""
+        decision = Decision(reasoning=["Greet"], action=Action.RESPOND, response="Hi")
+        live = basic_agent.create_session()
+        with patch.object(live, "_get_next_decision", return_value=decision):
+            res = live.next("Hello")
+
+        replayed = basic_agent.create_session()
+        assert replayed.record_response("Hello", res) is res
+        assert replayed.memory.context == live.memory.context
+
+        with pytest.raises(ValueError, match="Only RESPOND"):
+            replayed.record_response(
+                "Bye", Response(decision=Decision(reasoning=[], action=Action.END))
+            )
+
 
 class TestSessionStateOperations:
     """Test session state operations."""
@@ -739,12 +898,11 @@ class TestSessionPersistence:
 
     def test_save_and_load_session(self, basic_agent, tmp_path):
         """Test saving and loading a session."""
-        # Create a simple agent without complex tools to avoid pickle issues
         simple_steps = [
             Step(
                 step_id="start",
                 description="Start step",
-                available_tools=[],  # No tools to avoid pickle issues
+                available_tools=[],
                 routes=[Route(condition="always", target="end")],
             ),
             Step(step_id="end", description="End step", available_tools=[], routes=[]),
@@ -772,11 +930,11 @@ class TestSessionPersistence:
             session.save_session()
 
             # Verify file exists
-            pickle_file = Path(f"{session.session_id}.pkl")
-            assert pickle_file.exists()
+            state_file = Path(f"{session.session_id}.json")
+            assert state_file.exists()
 
             # Load session
-            loaded_session = Session.load_session(session.session_id)
+            loaded_session = simple_agent.load_session(session.session_id)
 
             # Verify session data
             assert loaded_session.session_id == session.session_id
@@ -787,10 +945,41 @@ class TestSessionPersistence:
         finally:
             os.chdir(original_cwd)
 
-    def test_load_nonexistent_session(self):
+    def test_save_and_load_session_with_tools(self, basic_agent, tmp_path, monkeypatch):
+        """Test that sessions with tools round-trip through the saved JSON state."""
+        monkeypatch.chdir(tmp_path)
+        session = basic_agent.create_session()
+        session._add_message("user", "Hello")
+        session.save_session()
+
+        loaded_session = basic_agent.load_session(session.session_id)
+        assert loaded_session.session_id == session.session_id
+        assert loaded_session.memory.context == session.memory.context
+        assert set(loaded_session.tools) == set(session.tools)
+
+    def test_load_pickled_session_warns(self, basic_agent, tmp_path, monkeypatch):
+        """Test that Session.load_session still reads sessions pickled before."""
+        monkeypatch.chdir(tmp_path)
+        simple_agent = Agent(
+            llm=basic_agent.llm,
+            name="simple_agent",
+            steps=[Step(step_id="start", description="Start step", routes=[])],
+            start_step_id="start",
+        )
+        session = simple_agent.create_session()
+        session._add_message("user", "Hello")
+        with open(f"{session.session_id}.pkl", "wb") as f:
+            pickle.dump(session, f)
+
+        with pytest.warns(DeprecationWarning):
+            loaded_session = Session.load_session(session.session_id)
+        assert loaded_session.session_id == session.session_id
+        assert len(loaded_session.memory.context) == len(session.memory.context)
+
+    def test_load_nonexistent_session(self, basic_agent):
         """Test loading a session that doesn't exist."""
         with pytest.raises(FileNotFoundError):
-            Session.load_session("nonexistent_session_id")
+            basic_agent.load_session("nonexistent_session_id")
 
 
 class TestSessionStateOperationsExtended:
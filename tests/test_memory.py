@@ -58,3 +58,26 @@ def test_flow_memory_enter_appends_summary():
 
     assert len(memory.context) == 1
     assert isinstance(memory.context[0], Summary)
+
+
+def test_memory_max_items_drops_oldest():
+    memory = Memory(max_items=3)
+    for i in range(5):
+        memory.add(Message(role="user", content=str(i)))
+    assert [m.content for m in memory.get_history()] == ["2", "3", "4"]
+
+
+def test_memory_max_items_trims_in_batches():
+    memory = Memory(max_items=8)
+    for i in range(10):
+        memory.add(Message(role="user", content=str(i)))
+    assert len(memory.context) == 10
+    memory.add(Message(role="user", content="10"))
+    assert [m.content for m in memory.get_history()] == [str(i) for i in range(3, 11)]
+
+
+def test_memory_max_items_from_env(monkeypatch):
+    monkeypatch.setenv("NOMOS_HISTORY_MAX", "2")
+    assert Memory().max_items == 2
+    monkeypatch.delenv("NOMOS_HISTORY_MAX")
+    assert Memory().max_items is None
@@ -18,3 +18,24 @@ def test_create_enum_basic():
     assert issubclass(Color, Enum)
     assert Color.RED.value == 1
     assert [member.name for member in Color] == ["RED", "BLUE"]
+
+
+def test_is_debug_enabled_follows_env(monkeypatch):
+    from nomos.utils import logging as nomos_logging
+
+    def _check(enable: str, level: str) -> bool:
+        monkeypatch.setenv("NOMOS_ENABLE_LOGGING", enable)
+        monkeypatch.setenv("NOMOS_LOG_LEVEL", level)
+        nomos_logging.get_logger.cache_clear()
+        nomos_logging.is_enabled_for.cache_clear()
+        return nomos_logging.is_debug_enabled()
+
+    try:
+        assert _check("true", "DEBUG") is True
+        assert _check("true", "WARNING") is False
+        assert _check("false", "DEBUG") is False
+        assert nomos_logging.is_enabled_for("ERROR") is False
+    finally:
+        monkeypatch.undo()
+        nomos_logging.get_logger.cache_clear()
+        nomos_logging.is_enabled_for.cache_clear()